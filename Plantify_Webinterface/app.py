@@ -1,15 +1,42 @@
-from flask import Flask, render_template, request, redirect, session, url_for, jsonify, flash
-from functools import wraps
+from flask import Flask, render_template, request, redirect, session, url_for, jsonify, flash, g, make_response, \
+    Response, has_request_context, before_render_template, template_rendered, stream_with_context
+from functools import wraps, partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
 import os
+import threading
+import time
 import base64
 import hashlib  # Explicitly import hashlib
+import json
+import gzip
+import mimetypes
+import zlib
 from email_validator import validate_email, EmailNotValidError
 import requests
 import requests.exceptions  # Neu: Für spezifische Request-Fehler
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional
 import urllib.parse
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from werkzeug.security import safe_join
+from werkzeug.middleware.proxy_fix import ProxyFix
 import logging  # Neu: Für Logging statt print()
+import sqlite3
+import multiprocessing
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+try:
+    import fcntl  # Dateisperren zwischen Worker-Prozessen (nicht unter Windows)
+except ImportError:
+    fcntl = None
+import numpy as np
 import sys  # Neu: Für sys.exit()
+from password_hashing import pbkdf2
 
 # --- Logging Konfiguration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,12 +53,538 @@ if not secret_key:
     sys.exit(1)  # Beendet die Anwendung, wenn der Schlüssel fehlt
 app.secret_key = secret_key
 
-API_BASE = 'http://plantify-api:5001'
+API_BASE = os.environ.get('PLANTIFY_API_BASE', 'http://plantify-api:5001')
+
+# --- Lastverteilung über mehrere plantify-api Instanzen ---
+# Kommagetrennte Basis-URLs; ohne Angabe wird nur PLANTIFY_API_BASE verwendet
+API_BASES = [base.strip().rstrip('/') for base in os.environ.get('PLANTIFY_API_BASES', API_BASE).split(',')
+             if base.strip()]
+API_BALANCE = os.environ.get('PLANTIFY_API_BALANCE', 'least-outstanding')  # oder 'latency'
+API_AFFINITY = os.environ.get('PLANTIFY_API_AFFINITY', '1') == '1'  # gleicher Topf -> gleiche Instanz
+API_AFFINITY_MAX_EXCESS = int(os.environ.get('PLANTIFY_API_AFFINITY_MAX_EXCESS', '4'))  # offene Requests über Minimum
+API_HEALTH_PATH = os.environ.get('PLANTIFY_API_HEALTH_PATH', '/')
+API_HEALTH_INTERVAL = float(os.environ.get('PLANTIFY_API_HEALTH_INTERVAL', '10'))  # 0 = nur passive Prüfung
+API_EJECT_FAILURES = int(os.environ.get('PLANTIFY_API_EJECT_FAILURES', '3'))  # Fehler in Folge bis zum Aussetzen
+API_EJECT_SECONDS = float(os.environ.get('PLANTIFY_API_EJECT_SECONDS', '30'))
+
+# --- HTTP-Client Konfiguration (Connection-Pool, Timeouts, Retries) ---
+API_POOL_SIZE = int(os.environ.get('PLANTIFY_API_POOL_SIZE', '20'))
+API_CONNECT_TIMEOUT = float(os.environ.get('PLANTIFY_API_CONNECT_TIMEOUT', '3.05'))
+API_READ_TIMEOUT = float(os.environ.get('PLANTIFY_API_READ_TIMEOUT', '10'))
+API_GET_RETRIES = int(os.environ.get('PLANTIFY_API_GET_RETRIES', '2'))
+API_RETRY_BACKOFF = float(os.environ.get('PLANTIFY_API_RETRY_BACKOFF', '0.3'))
+API_RETRY_STATUSES = (502, 503, 504)
+
+# Abweichende (connect, read) Timeouts pro Endpunkt-Präfix, z.B. für die schweren Plot-Antworten
+API_ENDPOINT_TIMEOUTS = {
+    '/plots/': (API_CONNECT_TIMEOUT, float(os.environ.get('PLANTIFY_API_PLOT_READ_TIMEOUT', '30'))),
+    '/json/sunlight-30days': (API_CONNECT_TIMEOUT, float(os.environ.get('PLANTIFY_API_SERIES_READ_TIMEOUT', '20'))),
+    '/json/all-today': (API_CONNECT_TIMEOUT, float(os.environ.get('PLANTIFY_API_SERIES_READ_TIMEOUT', '20'))),
+}
+
+# Streaming-Proxy für große Antworten (Plots, Messreihen): Chunk-Größe und gzip-Kompression on the fly
+PROXY_CHUNK_SIZE = int(os.environ.get('PLANTIFY_PROXY_CHUNK_SIZE', str(64 * 1024)))
+PROXY_GZIP = os.environ.get('PLANTIFY_PROXY_GZIP', '1') == '1'
+PROXY_GZIP_LEVEL = int(os.environ.get('PLANTIFY_PROXY_GZIP_LEVEL', '6'))
+
+# Gleichzeitige identische GET-Aufrufe an die API zu einem Aufruf zusammenfassen (single-flight);
+# gestreamte Antworten werden dafür bis zu dieser Größe (Bytes) für wartende Requests mitgeschnitten
+COALESCE_REQUESTS = os.environ.get('PLANTIFY_COALESCE', '1') == '1'
+COALESCE_MAX_BYTES = int(os.environ.get('PLANTIFY_COALESCE_MAX_BYTES', str(16 * 1024 * 1024)))
+# Höchstzahl gleichzeitiger Hintergrund-Threads, die gestreamte Antworten für Wartende mitschneiden
+STREAM_PUMPS = int(os.environ.get('PLANTIFY_STREAM_PUMPS', '4'))
+
+# Statische Dateien: fingerprinted URLs (?v=<hash>) dürfen ein Jahr gecacht werden
+STATIC_MAX_AGE = int(os.environ.get('PLANTIFY_STATIC_MAX_AGE', str(365 * 24 * 3600)))
+STATIC_PRECOMPRESS_MAX_BYTES = int(os.environ.get('PLANTIFY_STATIC_PRECOMPRESS_MAX_BYTES', str(1024 * 1024)))
+# Dynamische gzip-Kompression für HTML/JSON-Antworten ab dieser Größe (Bytes, 0 = aus)
+COMPRESS_MIN_SIZE = int(os.environ.get('PLANTIFY_COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_LEVEL = int(os.environ.get('PLANTIFY_COMPRESS_LEVEL', '6'))
+COMPRESS_MIMETYPES = {'text/html', 'text/plain', 'text/css', 'application/json', 'application/javascript',
+                      'text/javascript', 'image/svg+xml'}
+
+# Speicher für lokale Pflanzen-Änderungen: 'sqlite' (persistent, von allen Workern geteilt) oder 'memory'
+PLANT_OVERRIDE_STORE = os.environ.get('PLANTIFY_OVERRIDE_STORE', 'sqlite')
+PLANT_OVERRIDE_DB = os.environ.get('PLANTIFY_OVERRIDE_DB', os.path.join(app.instance_path, 'plant_overrides.sqlite3'))
+PLANT_OVERRIDE_MAX_ENTRIES = int(os.environ.get('PLANTIFY_OVERRIDE_MAX_ENTRIES', '10000'))
+
+# Cache für Zimmer/Pflanzen pro Benutzer (Sekunden bzw. Anzahl Einträge)
+DATA_CACHE_TTL = float(os.environ.get('PLANTIFY_CACHE_TTL', '30'))
+DATA_CACHE_MAXSIZE = int(os.environ.get('PLANTIFY_CACHE_MAXSIZE', '1024'))
+# Wie lange abgelaufene Einträge noch ausgeliefert werden, während sie im Hintergrund erneuert werden
+DATA_CACHE_STALE_TTL = float(os.environ.get('PLANTIFY_CACHE_STALE_TTL', '600'))
+# Invalidierung über alle Worker-Prozesse: jede Änderung setzt die Änderungszeit dieser Datei neu
+USER_DATA_GENERATION_FILE = os.environ.get('PLANTIFY_CACHE_GENERATION_FILE',
+                                           os.path.join(app.instance_path, 'user_data.generation'))
+LATEST_VALUE_TTL = float(os.environ.get('PLANTIFY_LATEST_VALUE_TTL', '10'))
+
+# Circuit Breaker pro API-Endpunkt: Fehler in Folge bis zum Öffnen, Sekunden bis zum nächsten Versuch
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('PLANTIFY_BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.environ.get('PLANTIFY_BREAKER_RESET_TIMEOUT', '30'))
+
+
+# Metriken: optionaler Bearer-Token für /metrics und Server-Timing-Header pro Antwort
+METRICS_TOKEN = os.environ.get('PLANTIFY_METRICS_TOKEN', '')
+SERVER_TIMING = os.environ.get('PLANTIFY_SERVER_TIMING', '0') == '1'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# --- Metriken (Prometheus-Textformat) ---
+class Metrics:
+    """
+    Minimal in-process registry of counters and latency histograms, rendered in the
+    Prometheus text exposition format. Values are per worker process.
+    """
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self._counters = {}  # (name, labels) -> Wert
+        self._histograms = {}  # (name, labels) -> [Bucket-Zähler..., Summe, Anzahl]
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, kind: str, text: str) -> None:
+        self._help[name] = (kind, text)
+
+    def inc(self, name: str, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0) + amount
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    @staticmethod
+    def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+        pairs = labels + extra
+        if not pairs:
+            return ""
+        escaped = (f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                   for key, value in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self, gauges: Optional[dict] = None) -> str:
+        """Render all metrics; `gauges` ({(name, labels): value}) are computed by the caller at scrape time."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+        lines, described = [], set()
+
+        def header(name: str, default_kind: str) -> None:
+            if name not in described:
+                kind, text = self._help.get(name, (default_kind, name))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                described.add(name)
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{self._format_labels(labels)} {value}")
+        for (name, labels), value in sorted((gauges or {}).items()):
+            header(name, "gauge")
+            lines.append(f"{name}{self._format_labels(labels)} {value}")
+        for (name, labels), values in sorted(histograms.items()):
+            header(name, "histogram")
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{name}_bucket{self._format_labels(labels, (('le', bound),))} {count}")
+            lines.append(f"{name}_bucket{self._format_labels(labels, (('le', '+Inf'),))} {values[-1]}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {values[-2]}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics(LATENCY_BUCKETS)
+metrics.describe("plantify_http_requests_total", "counter", "Handled HTTP requests by route, method and status")
+metrics.describe("plantify_http_request_duration_seconds", "histogram", "Request handling time by route")
+metrics.describe("plantify_upstream_requests_total", "counter", "Calls to plantify-api by endpoint and outcome")
+metrics.describe("plantify_upstream_request_duration_seconds", "histogram", "Latency of calls to plantify-api")
+metrics.describe("plantify_cache_requests_total", "counter", "Cache lookups by cache and result (hit, stale, miss)")
+metrics.describe("plantify_template_render_seconds", "histogram", "Template rendering time by template")
+metrics.describe("plantify_password_hash_seconds", "histogram", "PBKDF2 time per password hash or check")
+metrics.describe("plantify_circuit_breaker_open", "gauge", "1 if the circuit breaker of an endpoint is not closed")
+metrics.describe("plantify_upstream_coalesced_total", "counter",
+                 "Upstream calls saved because an identical call was already in flight")
+metrics.describe("plantify_upstream_backend_requests_total", "counter",
+                 "Calls per plantify-api instance by result (ok, failure)")
+metrics.describe("plantify_upstream_backend_up", "gauge", "1 if a plantify-api instance receives requests")
+metrics.describe("plantify_upstream_backend_outstanding", "gauge", "Open requests per plantify-api instance")
+metrics.describe("plantify_upstream_backend_latency_seconds", "gauge",
+                 "Moving average of the latency per plantify-api instance")
+
+
+def record_timing(phase: str, seconds: float) -> None:
+    """Add time spent in a phase (upstream, render, hash) to the current request's Server-Timing."""
+    if has_request_context():
+        timings = g.setdefault('_server_timing', {})
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache whose entries expire after `ttl` seconds.
+    Once `maxsize` entries are stored, the least recently used one is evicted.
+    Expired entries are kept for another `stale_ttl` seconds and can still be
+    read via get_entry() for stale-while-revalidate.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name  # Name für die Cache-Metriken (None = keine Metriken)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, key) -> tuple:
+        """Return (value, is_fresh); (None, False) if the key is missing or too old."""
+        with self._lock:
+            entry = self._data.get(key)
+            now = time.monotonic()
+            if entry is not None and entry[0] + self.stale_ttl <= now:
+                del self._data[key]
+                entry = None
+            if entry is not None:
+                self._data.move_to_end(key)
+        if entry is None:
+            result = "miss"
+        else:
+            result = "hit" if entry[0] > now else "stale"
+        if self.name:
+            metrics.inc("plantify_cache_requests_total", (("cache", self.name), ("result", result)))
+        return (None, False) if entry is None else (entry[1], result == "hit")
+
+    def get(self, key, default=None):
+        value, fresh = self.get_entry(key)
+        return value if fresh else default
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+DATA_CACHE = TTLCache(DATA_CACHE_MAXSIZE, DATA_CACHE_TTL, DATA_CACHE_STALE_TTL, name="user_data")
+LATEST_VALUE_CACHE = TTLCache(DATA_CACHE_MAXSIZE, LATEST_VALUE_TTL, DATA_CACHE_STALE_TTL, name="latest_value")
+
+# Cache für Plot-HTML: Speicherobergrenze in Bytes und Gültigkeit der Datenstand-Kennung in Sekunden
+PLOT_CACHE_MAX_BYTES = int(os.environ.get('PLANTIFY_PLOT_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+PLOT_FRESHNESS_TTL = float(os.environ.get('PLANTIFY_PLOT_FRESHNESS_TTL', '60'))
+
+
+class ByteLRUCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its values in bytes
+    rather than by the number of entries.
+    """
+
+    def __init__(self, max_bytes: int, name: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.name = name  # Name für die Cache-Metriken (None = keine Metriken)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+        if self.name:
+            result = "miss" if entry is None else "hit"
+            metrics.inc("plantify_cache_requests_total", (("cache", self.name), ("result", result)))
+        return default if entry is None else entry[1]
+
+    def set(self, key, value, size: int) -> None:
+        if size > self.max_bytes:
+            return  # Einzelne Einträge größer als der gesamte Cache werden nicht gespeichert
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= old[0]
+            self._data[key] = (size, value)
+            self.size += size
+            while self.size > self.max_bytes:
+                evicted_size, _ = self._data.popitem(last=False)[1]
+                self.size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+
+PLOT_CACHE = ByteLRUCache(PLOT_CACHE_MAX_BYTES, name="plot")
+POT_VERSION_CACHE = TTLCache(DATA_CACHE_MAXSIZE, PLOT_FRESHNESS_TTL, name="pot_version")
+
+# Cache für vorgerenderte Template-Fragmente ({% cache %}): an/aus und Speicherobergrenze in Bytes
+FRAGMENT_CACHE_ENABLED = os.environ.get('PLANTIFY_FRAGMENT_CACHE', '1') == '1'
+FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('PLANTIFY_FRAGMENT_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+FRAGMENT_CACHE = ByteLRUCache(FRAGMENT_CACHE_MAX_BYTES, name="fragment")
+
+# Maximale Anzahl Töpfe pro Batch-Abfrage von /api/data/latest-values
+LATEST_VALUES_BATCH_LIMIT = int(os.environ.get('PLANTIFY_LATEST_VALUES_BATCH_LIMIT', '200'))
+
+# Darstellung der Dashboard-Plots: 'html' (Plot-Fragmente der API) oder 'data' (Zeitreihen, clientseitig gerendert)
+PLOT_MODE = os.environ.get('PLANTIFY_PLOT_MODE', 'html')
+PLOTLY_JS_URL = os.environ.get('PLANTIFY_PLOTLY_JS_URL', 'https://cdn.plot.ly/plotly-2.35.2.min.js')
+
+# Live-Updates der Messwerte per Server-Sent Events (hält pro Zuschauer eine Verbindung offen)
+LIVE_UPDATES = os.environ.get('PLANTIFY_LIVE_UPDATES', '0') == '1'
+STREAM_POLL_INTERVAL = float(os.environ.get('PLANTIFY_STREAM_POLL_INTERVAL', '10'))
+STREAM_HEARTBEAT = float(os.environ.get('PLANTIFY_STREAM_HEARTBEAT', '15'))
+
+# Rollierende Statistiken pro Topf: Bucket-Größe und Aufbewahrung (Sekunden), ausgewertete Fenster
+STATS_BUCKET_SECONDS = int(os.environ.get('PLANTIFY_STATS_BUCKET_SECONDS', '300'))
+STATS_RETENTION = int(os.environ.get('PLANTIFY_STATS_RETENTION', str(24 * 3600)))
+STATS_WINDOWS = tuple(int(w) for w in os.environ.get('PLANTIFY_STATS_WINDOWS', '3600,86400').split(','))
+# Höchstzahl geführter Töpfe (die am längsten unbenutzten fallen heraus) und Verwerfen nach Leerlauf (Sekunden)
+STATS_MAX_POTS = int(os.environ.get('PLANTIFY_STATS_MAX_POTS', '1024'))
+STATS_IDLE_TTL = float(os.environ.get('PLANTIFY_STATS_IDLE_TTL', str(STATS_RETENTION)))
+# Durchschnitt seit Monatsbeginn ändert sich langsam: so lange (Sekunden) wird die API-Antwort wiederverwendet
+AVERAGE_MTD_TTL = float(os.environ.get('PLANTIFY_AVERAGE_MTD_TTL', '900'))
+
+# Lokaler Zeitreihen-Speicher (memory-mapped Ringpuffer pro Topf, von allen Workern geteilt):
+# /api/data/* und /api/series/* laden dann nur noch neue Messwerte von der API nach
+TIMESERIES_ENABLED = os.environ.get('PLANTIFY_TIMESERIES', '0') == '1'
+TIMESERIES_DIR = os.environ.get('PLANTIFY_TIMESERIES_DIR', os.path.join(app.instance_path, 'timeseries'))
+# Messintervall der Sensoren in Sekunden; daraus ergibt sich die Größe des Rings für "heute"
+TIMESERIES_SAMPLE_INTERVAL = float(os.environ.get('PLANTIFY_TIMESERIES_SAMPLE_INTERVAL', '5'))
+# Messwerte pro Topf: ein ganzer Tag plus Reserve. Passt der Tag nicht hinein (kürzeres Intervall
+# oder kleinere Kapazität), wird /json/all-today direkt von der API geladen statt gekürzt geliefert.
+TIMESERIES_CAPACITY = int(os.environ.get('PLANTIFY_TIMESERIES_CAPACITY',
+                                         str(int(24 * 3600 / TIMESERIES_SAMPLE_INTERVAL) + 256)))
+TIMESERIES_REFRESH = float(os.environ.get('PLANTIFY_TIMESERIES_REFRESH', '30'))  # Sekunden zwischen Abgleichen
+TIMESERIES_OPEN_FILES = int(os.environ.get('PLANTIFY_TIMESERIES_OPEN_FILES', '256'))
+
+# Abweichungs-Alarme: Hintergrund-Abfrage aller bekannten Töpfe, Toleranz um den Sollwert,
+# Mindestdauer außerhalb des Bereichs bis zum Alarm (Sekunden)
+ALERTS_ENABLED = os.environ.get('PLANTIFY_ALERTS', '0') == '1'
+ALERT_INTERVAL = float(os.environ.get('PLANTIFY_ALERT_INTERVAL', '60'))
+ALERT_MIN_DURATION = float(os.environ.get('PLANTIFY_ALERT_MIN_DURATION', '900'))
+ALERT_TOLERANCES = {
+    'temperature': float(os.environ.get('PLANTIFY_ALERT_TOLERANCE_TEMPERATURE', '2')),
+    'air_humidity': float(os.environ.get('PLANTIFY_ALERT_TOLERANCE_AIR_HUMIDITY', '10')),
+    'soil_moisture': float(os.environ.get('PLANTIFY_ALERT_TOLERANCE_SOIL_MOISTURE', '10')),
+}
+
+# Passwort-Hashing (PBKDF2) in eigenem Prozess-Pool; 0 Worker = Hashing im Request-Thread wie bisher
+HASH_WORKERS = int(os.environ.get('PLANTIFY_HASH_WORKERS', '2'))
+HASH_QUEUE_LIMIT = int(os.environ.get('PLANTIFY_HASH_QUEUE_LIMIT', '16'))  # laufende + wartende Hash-Jobs
+HASH_TIMEOUT = float(os.environ.get('PLANTIFY_HASH_TIMEOUT', '10'))
+# Startmethode der Hash-Prozesse: kein fork() aus dem Worker, in dem schon Threads laufen
+HASH_START_METHOD = os.environ.get('PLANTIFY_HASH_START_METHOD', 'forkserver')
+
+# Begrenzung fehlgeschlagener Anmeldeversuche pro Konto bzw. IP-Adresse innerhalb des Zeitfensters (Sekunden).
+# Die Zähler gelten pro Worker-Prozess: mit N Gunicorn-Workern sind bis zu N-mal so viele Versuche möglich.
+# Die IP-Grenze ist optional (0 = aus): hinter einem Proxy ohne PLANTIFY_TRUSTED_PROXIES teilen sich sonst
+# alle Clients eine Adresse und sperren sich gegenseitig aus.
+LOGIN_MAX_FAILURES_PER_ACCOUNT = int(os.environ.get('PLANTIFY_LOGIN_MAX_FAILURES_PER_ACCOUNT', '5'))
+LOGIN_MAX_FAILURES_PER_IP = int(os.environ.get('PLANTIFY_LOGIN_MAX_FAILURES_PER_IP', '0'))
+LOGIN_FAILURE_WINDOW = float(os.environ.get('PLANTIFY_LOGIN_FAILURE_WINDOW', '300'))
+
+# Anzahl vertrauenswürdiger Reverse-Proxies (nginx, Docker) vor der App: Client-Adresse aus X-Forwarded-For
+TRUSTED_PROXIES = int(os.environ.get('PLANTIFY_TRUSTED_PROXIES', '0'))
+if TRUSTED_PROXIES > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES, x_proto=TRUSTED_PROXIES, x_host=TRUSTED_PROXIES)
+
+# Sammel-Endpunkt der API für mehrere GET-Abfragen in einem Aufruf (leer = lokaler Ersatz-Aggregator)
+API_BATCH_ENDPOINT = os.environ.get('PLANTIFY_API_BATCH_ENDPOINT', '')
+
+# Threads für Aktualisierungen abgelaufener Cache-Einträge im Hintergrund
+REFRESH_WORKERS = int(os.environ.get('PLANTIFY_REFRESH_WORKERS', '2'))
+
+# Aufwärmen der Caches nach Login/Registrierung: parallele Jobs, Anzahl meistbesuchter Zimmer mit Plots
+WARMUP_ENABLED = os.environ.get('PLANTIFY_WARMUP', '1') == '1'
+WARMUP_WORKERS = int(os.environ.get('PLANTIFY_WARMUP_WORKERS', '2'))
+WARMUP_ROOMS = int(os.environ.get('PLANTIFY_WARMUP_ROOMS', '2'))
+
+# Parallele Upstream-Aufrufe innerhalb eines Requests (0 = synchron wie bisher)
+UPSTREAM_WORKERS = int(os.environ.get('PLANTIFY_UPSTREAM_WORKERS', '0'))
+_upstream_executor = (
+    ThreadPoolExecutor(max_workers=UPSTREAM_WORKERS, thread_name_prefix='plantify-upstream')
+    if UPSTREAM_WORKERS > 0 else None
+)
+
+# Sammel-Endpunkte (/api/.../bulk): parallele Upstream-Aufrufe und maximale Anzahl Einträge pro Request
+BULK_WORKERS = int(os.environ.get('PLANTIFY_BULK_WORKERS', '8'))
+BULK_MAX_ITEMS = int(os.environ.get('PLANTIFY_BULK_MAX_ITEMS', '500'))
+_bulk_executor = ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix='plantify-bulk')
+
+# Aktuelle Messwerte mehrerer Töpfe: immer parallel, unabhängig von PLANTIFY_UPSTREAM_WORKERS
+LATEST_VALUES_WORKERS = int(os.environ.get('PLANTIFY_LATEST_VALUES_WORKERS', '8'))
+_latest_values_executor = ThreadPoolExecutor(max_workers=LATEST_VALUES_WORKERS,
+                                             thread_name_prefix='plantify-latest')
+
+
+# --- Speicher für Pflanzen-Overrides ---
+class MemoryOverrideStore:
+    """
+    Process-local override store (stand-in for a shared store in single-process setups).
+    Holds at most `max_entries` plants; the least recently updated one is evicted first.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.version = 0  # Ändert sich bei jeder Änderung der Overrides
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def current_version(self) -> int:
+        return self.version
+
+    def get_many(self, plant_ids) -> dict:
+        with self._lock:
+            return {plant_id: self._data[plant_id] for plant_id in plant_ids if plant_id in self._data}
+
+    def update(self, plant_id: int, values: dict) -> dict:
+        with self._lock:
+            merged = {**self._data.pop(plant_id, {}), **values}
+            self._data[plant_id] = merged
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            self.version += 1
+            return merged
 
-PLANT_OVERRIDES = {}
+
+class SQLiteOverrideStore:
+    """
+    Override store persisted in an SQLite database shared by all worker processes. Reads are
+    served from an in-process dict, which is reloaded whenever another process has committed
+    a change (detected via PRAGMA data_version); own writes update it directly.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._data_version = None
+        self._cache = {}
+        self.version = 0  # Ändert sich bei jeder Änderung der Overrides
+
+    def _connection(self) -> sqlite3.Connection:
+        # Verbindung erst im Worker-Prozess öffnen (nicht über fork() hinweg teilen)
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS plant_overrides ("
+                "plant_id INTEGER PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._pid = os.getpid()
+            self._data_version = None
+        return self._conn
+
+    def _refresh(self, conn: sqlite3.Connection) -> None:
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            rows = conn.execute("SELECT plant_id, data FROM plant_overrides").fetchall()
+            self._cache = {plant_id: json.loads(data) for plant_id, data in rows}
+            self._data_version = data_version
+            self.version += 1
+
+    def current_version(self) -> int:
+        """Return the version after picking up changes committed by other processes."""
+        with self._lock:
+            self._refresh(self._connection())
+            return self.version
+
+    def get_many(self, plant_ids) -> dict:
+        with self._lock:
+            self._refresh(self._connection())
+            return {plant_id: self._cache[plant_id] for plant_id in plant_ids if plant_id in self._cache}
+
+    def update(self, plant_id: int, values: dict) -> dict:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT data FROM plant_overrides WHERE plant_id = ?", (plant_id,)).fetchone()
+                merged = {**(json.loads(row[0]) if row else {}), **values}
+                conn.execute(
+                    "INSERT OR REPLACE INTO plant_overrides (plant_id, data, updated_at) VALUES (?, ?, ?)",
+                    (plant_id, json.dumps(merged), time.time())
+                )
+                evicted = conn.execute(
+                    "DELETE FROM plant_overrides WHERE plant_id NOT IN "
+                    "(SELECT plant_id FROM plant_overrides ORDER BY updated_at DESC LIMIT ?)",
+                    (self.max_entries,)
+                ).rowcount
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            # Write-through: eigener Commit ändert data_version dieser Verbindung nicht
+            if evicted:
+                self._data_version = None
+            self._refresh(conn)
+            self._cache[plant_id] = merged
+            self.version += 1
+            return merged
+
+
+def create_override_store():
+    if PLANT_OVERRIDE_STORE == 'memory':
+        return MemoryOverrideStore(PLANT_OVERRIDE_MAX_ENTRIES)
+    return SQLiteOverrideStore(PLANT_OVERRIDE_DB, PLANT_OVERRIDE_MAX_ENTRIES)
+
+
+PLANT_OVERRIDES = create_override_store()
 
 
 # --- Hilfsfunktionen für API-Aufrufe mit verbesserter Fehlerbehandlung ---
+def _create_api_session() -> requests.Session:
+    """
+    Create the shared keep-alive session used for every call to plantify-api.
+    Only idempotent GET requests are retried (with exponential backoff). With several
+    instances (PLANTIFY_API_BASES) the adapter does not retry; _send_api_request and
+    open_upstream_stream retry on another instance instead.
+    """
+    retry = Retry(
+        total=API_GET_RETRIES if len(API_BASES) == 1 else 0,
+        backoff_factor=API_RETRY_BACKOFF,
+        status_forcelist=API_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,  # Letzte Antwort wird über raise_for_status() behandelt
+    )
+    adapter = HTTPAdapter(pool_connections=API_POOL_SIZE, pool_maxsize=API_POOL_SIZE, max_retries=retry)
+    api_session = requests.Session()
+    api_session.mount("http://", adapter)
+    api_session.mount("https://", adapter)
+    return api_session
+
+
+api_session = _create_api_session()
+
+
+def _api_timeout(endpoint: str) -> tuple:
+    """Return the (connect, read) timeout for an API endpoint."""
+    for prefix, timeout in API_ENDPOINT_TIMEOUTS.items():
+        if endpoint.startswith(prefix):
+            return timeout
+    return API_CONNECT_TIMEOUT, API_READ_TIMEOUT
+
+
 def _encode_form_data(data: dict) -> dict:
     """
     Encode form data to handle special characters properly.
@@ -47,9 +600,289 @@ def _encode_form_data(data: dict) -> dict:
     return encoded_data
 
 
+class CircuitBreaker:
+    """
+    After `failure_threshold` consecutive failures the circuit opens and calls fail fast for
+    `reset_timeout` seconds. Then a single trial call is let through (half-open); its success
+    closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """Return the circuit breaker of an API endpoint (path without query string)."""
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(endpoint)
+        if breaker is None:
+            breaker = _circuit_breakers[endpoint] = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        return breaker
+
+
+class UpstreamBackend:
+    def __init__(self, base: str):
+        self.base = base
+        self.outstanding = 0
+        self.latency = None  # gleitender Mittelwert (EWMA) in Sekunden
+        self.failures = 0  # Fehler in Folge
+        self.down_until = 0.0  # monotonic; bis dahin ausgesetzt
+
+    def is_up(self, now: float) -> bool:
+        return now >= self.down_until
+
+
+class UpstreamBalancer:
+    """
+    Spreads calls across the plantify-api instances in PLANTIFY_API_BASES. Picks the instance
+    with the fewest open requests (or the lowest latency-weighted load, PLANTIFY_API_BALANCE=latency)
+    among those not suspended. With an affinity key (pot_id) the same instance is preferred via
+    rendezvous hashing, unless it has API_AFFINITY_MAX_EXCESS more open requests than the least
+    busy one. Instances are suspended for API_EJECT_SECONDS after API_EJECT_FAILURES consecutive
+    failures (passive) or a failed health check (active, every API_HEALTH_INTERVAL seconds).
+    If every instance is suspended, all of them are used again.
+    """
+    LATENCY_WEIGHT = 0.3  # Gewicht des neuesten Messwerts im gleitenden Mittel
+
+    def __init__(self, bases: list, strategy: str):
+        self.backends = [UpstreamBackend(base) for base in bases]
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._health_thread = None
+
+    def _load(self, backend: UpstreamBackend) -> tuple:
+        latency = backend.latency or 0.0
+        if self.strategy == 'latency':
+            return latency * (backend.outstanding + 1), backend.outstanding
+        return backend.outstanding, latency
+
+    def acquire(self, affinity_key=None, exclude=()) -> UpstreamBackend:
+        """
+        Pick an instance and count the call as open until release() is called. Instances in
+        `exclude` (already tried) are only picked when no other one is available.
+        """
+        if len(self.backends) == 1:
+            backend = self.backends[0]
+            with self._lock:
+                backend.outstanding += 1
+            return backend
+        self._start_health_checks()
+        now = time.monotonic()
+        with self._lock:
+            candidates = ([backend for backend in self.backends if backend.is_up(now) and backend not in exclude]
+                          or [backend for backend in self.backends if backend.is_up(now)] or self.backends)
+            backend = min(candidates, key=self._load)
+            if API_AFFINITY and affinity_key is not None:
+                preferred = max(candidates, key=lambda b: hashlib.md5(f"{affinity_key}|{b.base}".encode()).digest())
+                least = min(candidate.outstanding for candidate in candidates)
+                if preferred.outstanding - least <= API_AFFINITY_MAX_EXCESS:
+                    backend = preferred
+            backend.outstanding += 1
+        return backend
+
+    def release(self, backend: UpstreamBackend, seconds: float, ok: bool) -> None:
+        """End an open call; `ok` is False for connection errors, timeouts and 5xx responses."""
+        with self._lock:
+            backend.outstanding -= 1
+            if ok:
+                backend.failures = 0
+                backend.latency = seconds if backend.latency is None else (
+                    (1 - self.LATENCY_WEIGHT) * backend.latency + self.LATENCY_WEIGHT * seconds)
+            else:
+                backend.failures += 1
+                if backend.failures >= API_EJECT_FAILURES and len(self.backends) > 1:
+                    if backend.is_up(time.monotonic()):
+                        logging.warning("API-Instanz %s nach %d Fehlern für %.0fs ausgesetzt", backend.base,
+                                        backend.failures, API_EJECT_SECONDS)
+                    backend.down_until = time.monotonic() + API_EJECT_SECONDS
+        metrics.inc("plantify_upstream_backend_requests_total",
+                    (("backend", backend.base), ("result", "ok" if ok else "failure")))
+
+    def check_health(self) -> None:
+        """Probe every instance once; any response below 500 counts as healthy."""
+        for backend in self.backends:
+            try:
+                response = api_session.get(f"{backend.base}{API_HEALTH_PATH}", timeout=(API_CONNECT_TIMEOUT, 2))
+                healthy = response.status_code < 500
+                response.close()
+            except requests.exceptions.RequestException:
+                healthy = False
+            with self._lock:
+                was_up = backend.is_up(time.monotonic())
+                if healthy:
+                    backend.failures = 0
+                    backend.down_until = 0.0
+                else:
+                    backend.down_until = time.monotonic() + max(API_HEALTH_INTERVAL, API_EJECT_SECONDS)
+            if was_up != healthy:
+                logging.info("API-Instanz %s ist %s", backend.base, "wieder erreichbar" if healthy else "nicht erreichbar")
+
+    def _start_health_checks(self) -> None:
+        if API_HEALTH_INTERVAL <= 0 or self._health_thread is not None:
+            return
+        with self._lock:
+            if self._health_thread is None:
+                self._health_thread = threading.Thread(target=self._run_health_checks, name='plantify-api-health',
+                                                       daemon=True)
+                self._health_thread.start()
+
+    def _run_health_checks(self) -> None:
+        while True:
+            time.sleep(API_HEALTH_INTERVAL)
+            try:
+                self.check_health()
+            except Exception:
+                logging.exception("Fehler bei der Prüfung der API-Instanzen")
+
+    def gauges(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for backend in self.backends:
+                labels = (("backend", backend.base),)
+                result[("plantify_upstream_backend_up", labels)] = int(backend.is_up(now))
+                result[("plantify_upstream_backend_outstanding", labels)] = backend.outstanding
+                if backend.latency is not None:
+                    result[("plantify_upstream_backend_latency_seconds", labels)] = round(backend.latency, 6)
+            return result
+
+
+api_balancer = UpstreamBalancer(API_BASES, API_BALANCE)
+
+
+def _affinity_key(params: Optional[dict]):
+    return params.get("pot_id") if params else None
+
+
+def record_upstream_call(method: str, endpoint: str, outcome: str, seconds: Optional[float] = None) -> None:
+    metrics.inc("plantify_upstream_requests_total", (("endpoint", endpoint), ("method", method), ("outcome", outcome)))
+    if seconds is not None:
+        metrics.observe("plantify_upstream_request_duration_seconds", (("endpoint", endpoint), ("method", method)),
+                        seconds)
+        record_timing("upstream", seconds)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls: the first caller of a key (the leader) does the work,
+    callers arriving while it is in flight wait for it and share its result. Shared results
+    must be treated as read-only, like cached values.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key) -> tuple:
+        """Return (flight, is_leader); the leader must call finish() in every case."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def detach_unwatched(self, key, flight: _Flight) -> bool:
+        """
+        If nobody waits for `flight` yet, let later callers of `key` start their own flight and
+        return True. The leader must still call finish().
+        """
+        with self._lock:
+            if flight.waiters:
+                return False
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            return True
+
+    def finish(self, key, flight: _Flight, result=None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.result, flight.error = result, error
+        flight.done.set()
+
+    def do(self, key, call, label: str):
+        flight, leader = self.begin(key)
+        if not leader:
+            flight.done.wait()
+            metrics.inc("plantify_upstream_coalesced_total", (("endpoint", label),))
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            result = call()
+        except BaseException as e:
+            self.finish(key, flight, error=e)
+            raise
+        self.finish(key, flight, result)
+        return result
+
+
+upstream_flights = SingleFlight()
+
+
 def _make_api_request(method: str, endpoint: str, user_mail: Optional[str] = None, data: Optional[dict] = None,
                       params: Optional[dict] = None):
-    url = f"{API_BASE}{endpoint}"
+    """
+    Call plantify-api and return the decoded JSON response, or None on errors. Concurrent
+    identical GETs share one upstream call (PLANTIFY_COALESCE).
+    """
+    if method != "GET" or not COALESCE_REQUESTS:
+        return _send_api_request(method, endpoint, user_mail, data, params)
+    key = ("GET", endpoint, user_mail, json.dumps(params, sort_keys=True, default=str))
+    return upstream_flights.do(key, partial(_send_api_request, method, endpoint, user_mail, data, params), endpoint)
+
+
+def _send_api_request(method: str, endpoint: str, user_mail: Optional[str] = None, data: Optional[dict] = None,
+                      params: Optional[dict] = None):
+    affinity_key = _affinity_key(params)
     headers = {"Content-Type": "application/json"}  # Standardmäßig JSON
     
     # URL-encode query parameters to handle special characters
@@ -62,32 +895,389 @@ def _make_api_request(method: str, endpoint: str, user_mail: Optional[str] = Non
                 encoded_params[key] = value
         params = encoded_params
     
+    breaker = circuit_breaker(endpoint)
+    if not breaker.allow():
+        logging.warning(f"API-Aufruf übersprungen, Circuit Breaker offen ({method} {endpoint})")
+        record_upstream_call(method, endpoint, "circuit_open")
+        return None
+
+    # Mit mehreren Instanzen wiederholt die App GETs selbst, jeweils auf einer anderen Instanz
+    attempts = 1 + API_GET_RETRIES if method == "GET" and len(api_balancer.backends) > 1 else 1
+    tried = []
+    for attempt in range(attempts):
+        backend = api_balancer.acquire(affinity_key, exclude=tried)
+        if backend in tried:
+            time.sleep(API_RETRY_BACKOFF * 2 ** (attempt - 1))  # Keine andere Instanz verfügbar
+        tried.append(backend)
+        result, failure = _api_attempt(backend, method, endpoint, data, params)
+        if failure != "retry":
+            break
+    # 4xx bedeutet: API erreichbar, nur die Anfrage war fehlerhaft
+    if failure in (None, "client"):
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    return result
+
+
+def _api_attempt(backend: UpstreamBackend, method: str, endpoint: str, data: Optional[dict],
+                 params: Optional[dict]) -> tuple:
+    """
+    Send one call to one instance. Returns (decoded JSON or None, failure) where failure is None
+    on success, "client" for 4xx, "retry" for connection errors, timeouts and 502/503/504
+    (worth trying another instance for idempotent calls) and "error" otherwise.
+    """
+    url = f"{backend.base}{endpoint}"
+    timeout = _api_timeout(endpoint)
+    started = time.perf_counter()
+    outcome = "error"
+    healthy = False  # Instanz hat geantwortet (Erfolg oder 4xx)
     try:
         if method == "GET":
-            response = requests.get(url, params=params)
+            response = api_session.get(url, params=params, timeout=timeout)
         elif method == "POST":
-            response = requests.post(url, json=data, params=params)  # params für mögliche GET-Parameter bei POST
+            # params für mögliche GET-Parameter bei POST
+            response = api_session.post(url, json=data, params=params, timeout=timeout)
         elif method == "PATCH":
-            response = requests.patch(url, json=data, params=params)  # params für mögliche GET-Parameter bei PATCH
+            # params für mögliche GET-Parameter bei PATCH
+            response = api_session.patch(url, json=data, params=params, timeout=timeout)
         elif method == "DELETE":
-            response = requests.delete(url, json=data, params=params)
+            response = api_session.delete(url, json=data, params=params, timeout=timeout)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
         response.raise_for_status()  # Löst HTTPError für 4xx/5xx Statuscodes aus
-        return response.json()
+        healthy = True
+        outcome = "success"
+        return response.json(), None
     except requests.exceptions.HTTPError as e:
-        logging.error(f"API HTTP-Fehler ({method} {url}): Status {e.response.status_code} - {e.response.text}")
-        return None
+        status = e.response.status_code
+        outcome = f"http_{status // 100}xx"
+        healthy = status < 500
+        logging.error(f"API HTTP-Fehler ({method} {url}): Status {status} - {e.response.text}")
+        if status < 500:
+            return None, "client"
+        return None, "retry" if status in API_RETRY_STATUSES else "error"
     except requests.exceptions.ConnectionError as e:
+        outcome = "timeout" if isinstance(e, requests.exceptions.Timeout) else "connection_error"
         logging.error(f"API Verbindungsfehler ({method} {url}): {e}")
-        return None
+        return None, "retry"
     except requests.exceptions.Timeout as e:
+        outcome = "timeout"
         logging.error(f"API Timeout Fehler ({method} {url}): {e}")
-        return None
+        return None, "retry"
     except requests.exceptions.RequestException as e:
         logging.error(f"Unbekannter API-Fehler ({method} {url}): {e}")
+        return None, "error"
+    finally:
+        elapsed = time.perf_counter() - started
+        api_balancer.release(backend, elapsed, healthy)
+        record_upstream_call(method, endpoint, outcome, elapsed)
+
+
+# --- Parallele Upstream-Aufrufe (opt-in) ---
+def run_concurrently(calls: dict, executor: Optional[ThreadPoolExecutor] = None) -> dict:
+    """
+    Execute independent zero-argument callables and return their results by key.
+    With an executor (default: the upstream pool, if enabled) they run in parallel,
+    otherwise one after another. Must not be called from inside a pool worker.
+    """
+    executor = executor or _upstream_executor
+    if executor is None or len(calls) < 2:
+        return {key: call() for key, call in calls.items()}
+    futures = {key: executor.submit(call) for key, call in calls.items()}
+    return {key: future.result() for key, future in futures.items()}
+
+
+def gather_api_requests(calls: dict, executor: Optional[ThreadPoolExecutor] = None) -> dict:
+    """
+    Run several _make_api_request calls, each given as a dict of its keyword arguments,
+    and return the decoded responses (or None) by key.
+    """
+    return run_concurrently({key: partial(_make_api_request, **kwargs) for key, kwargs in calls.items()}, executor)
+
+
+def fetch_composite(queries: dict, executor: Optional[ThreadPoolExecutor] = None) -> dict:
+    """
+    Resolve several upstream GET queries, given as {name: (endpoint, params)}, in one batch and
+    return the decoded responses (or None) by name. If the API offers a batch endpoint
+    (PLANTIFY_API_BATCH_ENDPOINT) they are sent as a single POST of
+    {"requests": [{"id", "endpoint", "params"}, ...]} expecting {"responses": {id: body}};
+    otherwise the local stand-in aggregator runs them via gather_api_requests (on `executor`,
+    if given).
+    """
+    if not queries:
+        return {}
+    if API_BATCH_ENDPOINT and len(queries) > 1:
+        response_data = _make_api_request("POST", API_BATCH_ENDPOINT, data={"requests": [
+            {"id": str(name), "endpoint": endpoint, "params": params}
+            for name, (endpoint, params) in queries.items()
+        ]})
+        if isinstance(response_data, dict) and isinstance(response_data.get("responses"), dict):
+            responses = response_data["responses"]
+            return {name: responses.get(str(name)) for name in queries}
+        logging.warning("API-Sammelabfrage fehlgeschlagen, verwende Einzelabfragen.")
+    return gather_api_requests({
+        name: {"method": "GET", "endpoint": endpoint, "params": params}
+        for name, (endpoint, params) in queries.items()
+    }, executor)
+
+
+# --- Aktualisierung im Hintergrund (stale-while-revalidate) ---
+_refresh_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='plantify-refresh')
+_pending_refreshes = set()
+_pending_refreshes_lock = threading.Lock()
+
+
+def refresh_in_background(key, refresh) -> None:
+    """Run `refresh()` on the background pool unless a refresh for `key` is already pending."""
+    with _pending_refreshes_lock:
+        if key in _pending_refreshes:
+            return
+        _pending_refreshes.add(key)
+
+    def run():
+        try:
+            refresh()
+        except Exception:
+            logging.exception("Hintergrund-Aktualisierung fehlgeschlagen (%s)", key)
+        finally:
+            with _pending_refreshes_lock:
+                _pending_refreshes.discard(key)
+
+    _refresh_executor.submit(run)
+
+
+# --- Cache-Schicht für Zimmer- und Pflanzendaten ---
+_user_data_generation = 0  # Stand der Generationsdatei, zu dem DATA_CACHE gehört
+_user_data_lock = threading.Lock()
+
+
+def _read_user_data_generation() -> int:
+    try:
+        return os.stat(USER_DATA_GENERATION_FILE).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _sync_user_data_generation() -> int:
+    """
+    Drop DATA_CACHE if another worker process invalidated the user data since it was filled
+    (see PLANTIFY_CACHE_GENERATION_FILE) and return the current generation.
+    """
+    global _user_data_generation
+    generation = _read_user_data_generation()
+    if generation > _user_data_generation:
+        with _user_data_lock:
+            if generation > _user_data_generation:
+                _user_data_generation = generation
+                DATA_CACHE.clear()
+    return _user_data_generation
+
+
+def invalidate_user_data() -> None:
+    """
+    Drop all cached rooms/plants in every worker process. Pots and plants can be shared
+    between users, so a write by one user invalidates the cached data of every user.
+    """
+    global _user_data_generation
+    with _user_data_lock:
+        try:
+            os.makedirs(os.path.dirname(USER_DATA_GENERATION_FILE) or '.', exist_ok=True)
+            with open(USER_DATA_GENERATION_FILE, 'a'):
+                pass
+            stamp = max(time.time_ns(), _read_user_data_generation() + 1)
+            os.utime(USER_DATA_GENERATION_FILE, ns=(stamp, stamp))
+            _user_data_generation = max(_read_user_data_generation(), _user_data_generation + 1)
+        except OSError as e:
+            logging.warning("Cache-Invalidierung konnte nicht an andere Worker weitergegeben werden: %s", e)
+            _user_data_generation += 1
+        DATA_CACHE.clear()
+    g.pop('_user_data', None)
+    g.pop('user_data_index', None)
+
+
+def invalidates_user_data(f):
+    """Decorator for write endpoints: invalidates the data cache after a successful response."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = app.make_response(f(*args, **kwargs))
+        if response.status_code < 400:
+            invalidate_user_data()
+        return response
+
+    return decorated_function
+
+
+def _rooms_from_response(response_data) -> Optional[list]:
+    if response_data is None:
+        return None
+    return [
+        {"name": p.get("pot_name", p.get("name", "")), "id": p.get("pot_id")}
+        for p in response_data
+    ]
+
+
+def _plants_from_response(response_data) -> Optional[list]:
+    if response_data is None:
         return None
+    plants = []
+    for item in response_data:
+        plant = {
+            "id": item.get("plant_id"),
+            "name": item.get("name"),
+            "facts": item.get("description", ""),
+            "room": item.get("pot_name", item.get("name", "Unbekannter Raum")),  # Verbesserte Konsistenz
+            "target_temperature": item.get("target_temperature_celsius"),
+            "target_air_humidity": item.get("target_air_humidity_percent"),
+            "target_ground_humidity": item.get("target_soil_moisture_percent"),
+        }
+        plants.append(plant)
+    return plants
+
+
+def _apply_plant_overrides(plants: list) -> list:
+    """Merge the stored overrides into the (cached, unmodified) plant list."""
+    overrides = PLANT_OVERRIDES.get_many(plant["id"] for plant in plants)
+    if not overrides:
+        return plants
+    return [{**plant, **overrides[plant["id"]]} if plant["id"] in overrides else plant for plant in plants]
+
+
+# Pro Benutzer gecachte Daten: Endpunkt und Umwandlung der API-Antwort
+_USER_DATA_QUERIES = {
+    "rooms": ("/json/pots", _rooms_from_response),
+    "plants": ("/json/plants", _plants_from_response),
+}
+
+
+def _load_user_data(user: str, kind: str) -> Optional[list]:
+    endpoint, transform = _USER_DATA_QUERIES[kind]
+    return transform(_make_api_request("GET", endpoint, params={"user_mail": user}))
+
+
+def _store_user_data(user: str, kind: str, value: list, generation: int) -> None:
+    # Nicht speichern, wenn während des Ladens ein Schreibzugriff (auch in einem anderen Worker)
+    # den Cache invalidiert hat
+    _sync_user_data_generation()
+    with _user_data_lock:
+        if generation == _user_data_generation:
+            DATA_CACHE.set((kind, user), value)
+
+
+def _refresh_user_data(user: str, kind: str) -> None:
+    generation = _sync_user_data_generation()
+    value = _load_user_data(user, kind)
+    if value is not None:
+        _store_user_data(user, kind, value, generation)
+
+
+def _cached_user_data(user: str, kinds: tuple, queries: Optional[dict] = None,
+                      executor: Optional[ThreadPoolExecutor] = None) -> dict:
+    """
+    Return the requested data kinds ("rooms", "plants") for a user, deduplicated within the
+    request (flask.g) and shared across requests via DATA_CACHE. Missing kinds are fetched in
+    one batch together with the additional upstream `queries` ({name: (endpoint, params)}),
+    whose responses are returned under their names; the batch runs on `executor`, if given
+    (see fetch_composite). Expired entries are still served while
+    they are refreshed in the background. Failed loads (None) are not cached across
+    requests. The returned lists are shared between requests and must not be mutated by callers.
+    """
+    generation = _sync_user_data_generation()
+    request_cache = g.setdefault('_user_data', {})
+    result, batch = {}, dict(queries or {})
+    missing = []
+    for kind in kinds:
+        key = (kind, user)
+        if key in request_cache:
+            result[kind] = request_cache[key]
+            continue
+        value, fresh = DATA_CACHE.get_entry(key)
+        if value is None:
+            missing.append(kind)
+            batch[kind] = (_USER_DATA_QUERIES[kind][0], {"user_mail": user})
+        else:
+            if not fresh:
+                refresh_in_background(key, partial(_refresh_user_data, user, kind))
+            result[kind] = request_cache[key] = value
+
+    responses = fetch_composite(batch, executor)
+    for kind in missing:
+        value = _USER_DATA_QUERIES[kind][1](responses.pop(kind))
+        if value is not None:
+            _store_user_data(user, kind, value, generation)
+        result[kind] = request_cache[(kind, user)] = value
+    result.update(responses)
+    return result
+
+
+# --- Cache für aktuelle Messwerte ---
+def _fetch_latest_values(pot_ids: list) -> dict:
+    """Fetch the latest value of each pot in one batch; failed pots map to None."""
+    return fetch_composite({pot_id: ("/json/latest-value", {"pot_id": pot_id}) for pot_id in pot_ids},
+                           _upstream_executor or _latest_values_executor)
+
+
+def _store_latest_values(values: dict) -> None:
+    for pot_id, value in values.items():
+        if value is not None:
+            LATEST_VALUE_CACHE.set(pot_id, value)
+
+
+def _cached_latest_values(pot_ids) -> tuple:
+    """
+    Return ({pot_id: value} from the cache, [pot ids not cached]). Expired values are returned
+    as well and refreshed in the background.
+    """
+    values, stale, missing = {}, [], []
+    for pot_id in pot_ids:
+        value, fresh = LATEST_VALUE_CACHE.get_entry(pot_id)
+        if value is None:
+            missing.append(pot_id)
+            continue
+        values[pot_id] = value
+        if not fresh:
+            stale.append(pot_id)
+    if stale:
+        refresh_in_background(("latest-values", tuple(stale)),
+                              lambda: _store_latest_values(_fetch_latest_values(stale)))
+    return values, missing
+
+
+def latest_values_for(pot_ids) -> dict:
+    """Latest value per pot (cached, stale-while-revalidate); pots without a value map to None."""
+    values, missing = _cached_latest_values(pot_ids)
+    if missing:
+        fetched = _fetch_latest_values(missing)
+        _store_latest_values(fetched)
+        values.update(fetched)
+    return values
+
+
+def load_view_data(queries: Optional[dict] = None, latest_value_pots=()) -> dict:
+    """
+    Resolve all data a view needs in one batch and return it as one dict: the current user's
+    "rooms" and "plants" (cached, without overrides), the "latest_values" of the given pots
+    and the responses of the additional upstream GET `queries` ({name: (endpoint, params)})
+    under their names. Only data missing from the caches is fetched.
+    """
+    queries = dict(queries or {})
+    latest_values, missing = _cached_latest_values(latest_value_pots)
+    for pot_id in missing:
+        queries[f"latest-value:{pot_id}"] = ("/json/latest-value", {"pot_id": pot_id})
+    # Fehlende Messwerte wie beim Sammel-Endpunkt parallel laden, nicht nacheinander
+    executor = _upstream_executor or (_latest_values_executor if missing else None)
+
+    user = session.get('user_id')
+    if user:
+        data = _cached_user_data(user, ("rooms", "plants"), queries, executor)
+    else:
+        data = {"rooms": [], "plants": [], **fetch_composite(queries, executor)}
+
+    fetched = {pot_id: data.pop(f"latest-value:{pot_id}") for pot_id in missing}
+    _store_latest_values(fetched)
+    data["latest_values"] = {**latest_values, **fetched}
+    return data
 
 
 # --- Aktualisierte fetch_rooms() ---
@@ -95,51 +1285,157 @@ def fetch_rooms():
     user = session.get('user_id')
     if not user:
         return []
+    return _cached_user_data(user, ("rooms",))["rooms"] or []
 
-    response_data = _make_api_request("GET", "/json/pots", params={"user_mail": user})
-    if response_data:
-        return [
-            {"name": p.get("pot_name", p.get("name", "")), "id": p.get("pot_id")}
-            for p in response_data
-        ]
-    return []
 
+class LazyList:
+    """
+    Read-only list that calls `loader` on first access. Lets templates receive the sidebar
+    data without fetching it when the page never renders it.
+    """
 
-# --- Aktualisierte fetch_plants() ---
-def fetch_plants():
-    user = session.get('user_id')
-    if not user:
-        return []
+    def __init__(self, loader):
+        self._loader = loader
+        self._items = None
 
-    response_data = _make_api_request("GET", "/json/plants", params={"user_mail": user})
-    if response_data:
-        plants = []
-        for item in response_data:
-            plant = {
-                "id": item.get("plant_id"),
-                "name": item.get("name"),
-                "facts": item.get("description", ""),
-                "room": item.get("pot_name", item.get("name", "Unbekannter Raum")),  # Verbesserte Konsistenz
-                "target_temperature": item.get("target_temperature_celsius"),
-                "target_air_humidity": item.get("target_air_humidity_percent"),
-                "target_ground_humidity": item.get("target_soil_moisture_percent"),
-            }
-            if plant["id"] in PLANT_OVERRIDES:
-                plant.update(PLANT_OVERRIDES[plant["id"]])
-            plants.append(plant)
-        return plants
-    return []
+    def _resolve(self) -> list:
+        if self._items is None:
+            self._items = self._loader()
+        return self._items
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __bool__(self):
+        return bool(self._resolve())
+
+    def __getitem__(self, index):
+        return self._resolve()[index]
+
+    def __repr__(self):
+        return repr(self._resolve()) if self._items is not None else "<LazyList (not loaded)>"
 
 
 @app.context_processor
 def inject_sidebar_data():
-    return dict(rooms=fetch_rooms(), plants=fetch_plants())
+    # Erst beim Zugriff im Template laden: Seiten ohne (oder mit nachgeladener) Sidebar
+    # lösen so keine API-Aufrufe aus
+    return dict(rooms=LazyList(lambda: user_data_index().rooms),
+                plants=LazyList(lambda: user_data_index().plants))
 
 
 def slugify(value: str) -> str:
     return value.lower().replace(" ", "-")
 
 
+class UserDataIndex:
+    """
+    Lookup tables over a user's rooms and plants (overrides applied). Built once per cached
+    room/plant list and override version instead of scanning and slugifying on every request.
+    """
+
+    def __init__(self, raw_rooms: list, raw_plants: list, override_version: int):
+        self.raw_rooms = raw_rooms
+        self.raw_plants = raw_plants
+        self.override_version = override_version
+        self.rooms = raw_rooms
+        self.plants = _apply_plant_overrides(raw_plants)
+        # Inhaltlicher Datenstand: bleibt gleich, wenn ein Neuladen dieselben Daten liefert
+        self.version = hashlib.sha1(
+            json.dumps([self.rooms, self.plants], sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        # Bei doppelten Slugs gewinnt wie bisher der erste Treffer
+        self.room_entries = [{'name': r['name'], 'slug': slugify(r['name'])} for r in self.rooms]
+        self.rooms_by_slug = {}
+        for room, entry in zip(self.rooms, self.room_entries):
+            self.rooms_by_slug.setdefault(entry['slug'], room)
+        self.plants_by_id = {}
+        self.plants_by_slug = {}
+        self.plants_by_room = {}
+        for plant in self.plants:
+            self.plants_by_id.setdefault(str(plant['id']), plant)
+            if plant['name']:
+                self.plants_by_slug.setdefault(slugify(plant['name']), plant)
+            self.plants_by_room.setdefault(plant.get('room'), []).append(plant)
+
+    def matches(self, raw_rooms: list, raw_plants: list, override_version: int) -> bool:
+        return (self.raw_rooms is raw_rooms and self.raw_plants is raw_plants
+                and self.override_version == override_version)
+
+
+EMPTY_USER_DATA_INDEX = UserDataIndex([], [], 0)
+
+
+def user_data_index(user: Optional[str] = None) -> UserDataIndex:
+    """
+    Return the lookup index for the current user (or the given one). It is cached next to the
+    room/plant lists and rebuilt only when those lists are reloaded or the plant overrides change.
+    """
+    if user is None:
+        user = session.get('user_id')
+    if not user:
+        return EMPTY_USER_DATA_INDEX
+    if 'user_data_index' in g:
+        return g.user_data_index
+
+    data = _cached_user_data(user, ("rooms", "plants"))
+    raw_rooms, raw_plants = data["rooms"] or [], data["plants"] or []
+    override_version = PLANT_OVERRIDES.current_version()
+    index = DATA_CACHE.get(("index", user))
+    if index is None or not index.matches(raw_rooms, raw_plants, override_version):
+        index = UserDataIndex(raw_rooms, raw_plants, override_version)
+        DATA_CACHE.set(("index", user), index)
+        stats_engine.set_targets(index.plants)
+    g.user_data_index = index
+    return index
+
+
+# --- Fragment-Cache für Templates ---
+def _fragment_key_part(value):
+    """Hashable stand-in for a {% cache %} argument; lists and dicts are reduced to a digest."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class FragmentCacheExtension(Extension):
+    """
+    `{% cache 'name', vary... %}...{% endcache %}` stores the rendered block in FRAGMENT_CACHE,
+    keyed by the logged-in user, the data version of their rooms/plants (UserDataIndex.version)
+    and the optional `vary` values. The block may therefore only depend on the user's rooms and
+    plants and on the `vary` values. Without a logged-in user the block is rendered normally.
+    """
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_render_cached", [nodes.List(args)]), [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, args: list, caller) -> str:
+        user = session.get('user_id') if has_request_context() else None
+        if not FRAGMENT_CACHE_ENABLED or not user:
+            return caller()
+        key = (user, user_data_index(user).version) + tuple(_fragment_key_part(arg) for arg in args)
+        html = FRAGMENT_CACHE.get(key)
+        if html is None:
+            html = caller()
+            FRAGMENT_CACHE.set(key, html, len(html.encode()))
+        return Markup(html)
+
+
+app.jinja_env.add_extension(FragmentCacheExtension)
+
+
 def is_valid_email(email: str) -> bool:
     """Validate an email address using the email-validator package."""
     if not email:
@@ -151,9 +1447,140 @@ def is_valid_email(email: str) -> bool:
         return False
 
 
+# --- Passwort-Hashing und Schutz vor Anmelde-Lastspitzen ---
+class HashingBusyError(Exception):
+    """Raised when the password hashing queue is full and the request has to be rejected."""
+
+
+_hash_pool = None
+_hash_pool_pid = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """Create the hashing pool lazily in the worker process that uses it."""
+    global _hash_pool, _hash_pool_pid
+    with _hash_pool_lock:
+        if _hash_pool is None or _hash_pool_pid != os.getpid():
+            start_method = (HASH_START_METHOD if HASH_START_METHOD in multiprocessing.get_all_start_methods()
+                            else 'spawn')
+            _hash_pool = ProcessPoolExecutor(max_workers=HASH_WORKERS,
+                                             mp_context=multiprocessing.get_context(start_method))
+            _hash_pool_pid = os.getpid()
+        return _hash_pool
+
+
+def _discard_hash_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool (e.g. a worker was killed) so that the next job starts a fresh one."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False)
+    logging.warning("Hash-Prozess-Pool defekt (Worker beendet), wird neu gestartet")
+
+
+def _run_pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    """
+    Compute PBKDF2 on the dedicated process pool so that login bursts cannot saturate the
+    request threads. At most HASH_QUEUE_LIMIT jobs may be running or waiting; beyond that
+    HashingBusyError is raised immediately instead of queueing more work.
+    """
+    started = time.perf_counter()
+    try:
+        return _submit_pbkdf2(password, salt, iterations)
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe("plantify_password_hash_seconds", (), elapsed)
+        record_timing("hash", elapsed)
+
+
+def _submit_pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    if HASH_WORKERS <= 0:
+        return pbkdf2(password.encode(), salt, iterations)
+    holding_slot = False
+    # Ist der Pool defekt, einmal mit einem neuen Pool wiederholen
+    for _ in range(2):
+        if not holding_slot and not _hash_slots.acquire(blocking=False):
+            raise HashingBusyError("Password hashing queue is full")
+        holding_slot = True
+        pool = _get_hash_pool()
+        try:
+            future = pool.submit(pbkdf2, password.encode(), salt, iterations)
+        except BrokenProcessPool:
+            _discard_hash_pool(pool)
+            continue
+        except Exception:
+            _hash_slots.release()
+            raise
+        # Slot erst freigeben, wenn der Job wirklich beendet ist (auch nach einem Timeout)
+        holding_slot = False
+        future.add_done_callback(lambda _: _hash_slots.release())
+        try:
+            return future.result(timeout=HASH_TIMEOUT)
+        except FutureTimeoutError as e:
+            raise HashingBusyError("Password hashing timed out") from e
+        except BrokenProcessPool:
+            _discard_hash_pool(pool)
+    if holding_slot:
+        _hash_slots.release()
+    raise HashingBusyError("Password hashing pool unavailable")
+
+
+class LoginThrottle:
+    """
+    Counts failed attempts per key (e.g. account or IP address) in a sliding time window.
+    Keys without recent failures expire, so memory stays bounded. Counts are kept per
+    worker process.
+    """
+
+    def __init__(self, window: float, maxsize: int = 100_000):
+        self.window = window
+        self._failures = TTLCache(maxsize, window)
+        self._lock = threading.Lock()
+
+    def _recent(self, key) -> list:
+        cutoff = time.monotonic() - self.window
+        return [t for t in self._failures.get(key, []) if t > cutoff]
+
+    def failures(self, key) -> int:
+        with self._lock:
+            return len(self._recent(key))
+
+    def record_failure(self, key) -> None:
+        with self._lock:
+            self._failures.set(key, self._recent(key) + [time.monotonic()])
+
+    def reset(self, key) -> None:
+        self._failures.pop(key)
+
+
+login_throttle = LoginThrottle(LOGIN_FAILURE_WINDOW)
+
+
+def _throttle_keys(email: Optional[str]) -> list:
+    """Throttle keys with their limits for the current request and the given account."""
+    keys = []
+    if LOGIN_MAX_FAILURES_PER_IP > 0:
+        keys.append((("ip", request.remote_addr), LOGIN_MAX_FAILURES_PER_IP))
+    if email:
+        keys.append((("account", email.lower()), LOGIN_MAX_FAILURES_PER_ACCOUNT))
+    return keys
+
+
+def is_login_throttled(email: Optional[str]) -> bool:
+    return any(login_throttle.failures(key) >= limit for key, limit in _throttle_keys(email))
+
+
+def record_login_failure(email: Optional[str]) -> None:
+    for key, _ in _throttle_keys(email):
+        login_throttle.record_failure(key)
+
+
 def hash_password(password: str, iterations: int = 100_000) -> str:
     salt = os.urandom(16)
-    hash_bytes = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    hash_bytes = _run_pbkdf2(password, salt, iterations)
     salt_b64 = base64.b64encode(salt).decode()
     hash_b64 = base64.b64encode(hash_bytes).decode()
     value = f"{iterations}${salt_b64}${hash_b64}"
@@ -170,10 +1597,158 @@ def check_password(password: str, hashed: str) -> bool:
     except Exception as e:
         logging.error(f"Fehler beim Parsen des gehashten Passworts: {e}")
         return False
-    hash_test = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    hash_test = _run_pbkdf2(password, salt, iterations)
     return hash_test == hash_true
 
 
+# --- Instrumentierung: Laufzeiten pro Route, Template und Server-Timing ---
+@app.before_request
+def start_request_timer():
+    g._request_started = time.perf_counter()
+
+
+@before_render_template.connect_via(app)
+def _start_render_timer(sender, template, context, **extra):
+    g._render_started = time.perf_counter()
+
+
+@template_rendered.connect_via(app)
+def _record_render_time(sender, template, context, **extra):
+    started = g.pop('_render_started', None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        metrics.observe("plantify_template_render_seconds", (("template", template.name),), elapsed)
+        record_timing("render", elapsed)
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('_request_started')
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    metrics.inc("plantify_http_requests_total",
+                (("route", route), ("method", request.method), ("status", response.status_code)))
+    metrics.observe("plantify_http_request_duration_seconds", (("route", route), ("method", request.method)), elapsed)
+    if SERVER_TIMING:
+        timings = g.get('_server_timing', {})
+        entries = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in timings.items()]
+        entries.append(f"total;dur={elapsed * 1000:.1f}")
+        response.headers['Server-Timing'] = ", ".join(entries)
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose the collected metrics in the Prometheus text format"""
+    if METRICS_TOKEN and request.headers.get('Authorization') != f"Bearer {METRICS_TOKEN}":
+        return "Unauthorized", 401
+    with _circuit_breakers_lock:
+        breakers = dict(_circuit_breakers)
+    gauges = {
+        ("plantify_circuit_breaker_open", (("endpoint", endpoint),)): int(breaker.state != "closed")
+        for endpoint, breaker in breakers.items()
+    }
+    gauges.update(api_balancer.gauges())
+    return metrics.render(gauges), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+# --- Statische Dateien: Fingerprints, vorkomprimierte Varianten und Kompression ---
+class StaticAsset:
+    """A static file held in memory with its content hash and a precompressed gzip variant."""
+
+    def __init__(self, path: str):
+        self.mtime = os.path.getmtime(path)
+        with open(path, 'rb') as f:
+            self.body = f.read()
+        self.digest = hashlib.sha1(self.body).hexdigest()[:12]
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.gzip_body = None
+        if self.mimetype in COMPRESS_MIMETYPES:
+            compressed = gzip.compress(self.body, compresslevel=9, mtime=0)
+            if len(compressed) < len(self.body):
+                self.gzip_body = compressed
+
+
+_static_assets = {}
+_static_assets_lock = threading.Lock()
+
+
+def static_asset(filename: str) -> Optional[StaticAsset]:
+    """Return the cached asset for a file in the static folder (reloaded when it changes on disk)."""
+    path = safe_join(app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+    with _static_assets_lock:
+        asset = _static_assets.get(filename)
+    if asset is not None and asset.mtime == os.path.getmtime(path):
+        return asset
+    if os.path.getsize(path) > STATIC_PRECOMPRESS_MAX_BYTES:
+        return None
+    asset = StaticAsset(path)
+    with _static_assets_lock:
+        _static_assets[filename] = asset
+    return asset
+
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    # url_for('static', filename=...) hängt den Inhalts-Hash an, neue Versionen bekommen neue URLs
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        asset = static_asset(values['filename'])
+        if asset is not None:
+            values['v'] = asset.digest
+
+
+def send_static_asset(filename):
+    """Serve static files from memory, gzipped if the client accepts it"""
+    asset = static_asset(filename)
+    if asset is None:
+        return app.send_static_file(filename)
+    if asset.gzip_body is not None and 'gzip' in request.accept_encodings:
+        response = make_response(asset.gzip_body)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(f"{asset.digest}-gz")
+    else:
+        response = make_response(asset.body)
+        response.set_etag(asset.digest)
+    response.mimetype = asset.mimetype
+    response.vary.add('Accept-Encoding')
+    response.last_modified = asset.mtime
+    response.cache_control.public = True
+    if request.args.get('v') == asset.digest:
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True  # Ohne Fingerprint immer per ETag revalidieren
+    return response.make_conditional(request)
+
+
+app.view_functions['static'] = send_static_asset
+
+
+@app.after_request
+def compress_response(response):
+    """gzip larger HTML/JSON responses; streamed and already encoded responses are left alone."""
+    if (not COMPRESS_MIN_SIZE or response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or 'gzip' not in request.accept_encodings):
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)  # Gleicher Inhalt, andere Bytes: nur noch schwach gleich
+    return response
+
+
 # --- Login-Decorator für geschützte Seiten ---
 def login_required(f):
     @wraps(f)
@@ -211,17 +1786,30 @@ def login():
         form_data = _encode_form_data(request.form.to_dict())
         email = form_data.get('email')
         password = form_data.get('password')
+        if is_login_throttled(email):
+            flash("Zu viele fehlgeschlagene Anmeldeversuche. Bitte versuchen Sie es später erneut.", "danger")
+            logging.warning("Login gedrosselt für E-Mail %s von %s.", email, request.remote_addr)
+            return render_template('login.html', error='Zu viele Anmeldeversuche!'), 429
         hashed = get_password_hash(email)
         logging.debug("E-Mail: %s", email)
         logging.debug(
             "Passwort (nicht gehasht): [ausgeblendet aus Sicherheitsgründen]")  # Keine Klartext-Passwörter loggen
         logging.debug("Gehasht: %s", hashed)
-        if hashed and check_password(password, hashed):
+        try:
+            valid = bool(hashed) and check_password(password or '', hashed)
+        except HashingBusyError:
+            flash("Der Server ist gerade ausgelastet. Bitte versuchen Sie es gleich erneut.", "danger")
+            logging.warning("Login für E-Mail %s abgelehnt: Hashing-Warteschlange voll.", email)
+            return render_template('login.html', error='Server ausgelastet!'), 503
+        if valid:
+            login_throttle.reset(("account", email.lower()))
             session['user_id'] = email
             logging.info("Benutzer %s erfolgreich angemeldet.", email)
+            start_warmup(email)
             next_page = request.args.get('next')
             flash("Erfolgreich angemeldet!", "success")
             return redirect(next_page or url_for('index'))
+        record_login_failure(email)
         flash("Falsche Login-Daten!", "danger")
         logging.warning("Fehlgeschlagener Login-Versuch für E-Mail: %s", email)
         return render_template('login.html', error='Falsche Login-Daten!')
@@ -232,6 +1820,7 @@ def login():
 def logout():
     user_id = session.pop('user_id', None)  # user_id aus der Session entfernen
     if user_id:
+        warmup_jobs.cancel(user_id)
         logging.info("Benutzer %s abgemeldet.", user_id)
         flash("Sie wurden abgemeldet.", "info")
     return redirect(url_for('login'))  # Nach dem Logout zur Login-Seite weiterleiten
@@ -240,46 +1829,67 @@ def logout():
 @app.route('/dashboard/<slug>')
 @login_required
 def dashboard(slug):
-    rooms = fetch_rooms()
-    plants = fetch_plants()
-    room = next((r for r in rooms if slugify(r['name']) == slug), None)
+    index = user_data_index()
+    room = index.rooms_by_slug.get(slug)
     if not room:
         logging.warning("Dashboard-Zugriff: Zimmer-Slug '%s' nicht gefunden für Benutzer '%s'.", slug,
                         session.get('user_id'))
         flash("Zimmer nicht gefunden.", "warning")
         return "Zimmer nicht gefunden", 404
-    room_plants = [p for p in plants if p.get('room') == room['name']]
-    return render_template('dashboard.html', room=room['name'], room_slug=slug,
-                           room_plants=room_plants)
+    room_plants = index.plants_by_room.get(room['name'], [])
+    room_views.record(session.get('user_id'), room['name'])
+    # Messwerte der Tabelle in einem Sammelaufruf laden statt per Browser-Request
+    view_data = load_view_data(latest_value_pots=[plant['id'] for plant in room_plants])
+    return render_template('dashboard.html', room=room['name'], room_slug=slug, pot_id=room['id'],
+                           room_plants=room_plants, latest_values=view_data["latest_values"], plot_mode=PLOT_MODE,
+                           plotly_js_url=PLOTLY_JS_URL, live_updates=LIVE_UPDATES)
 
 
 # Seite zum Umbenennen der Zimmer
 @app.route('/rooms')
 @login_required
 def rooms_page():
-    rooms = fetch_rooms()
-    room_entries = [{'name': r['name'], 'slug': slugify(r['name'])} for r in rooms]
-    return render_template('rooms.html', rooms=room_entries)
+    # Nur die Zimmer laden; die Sidebar wird per /partials/sidebar nachgeladen
+    rooms = [{'name': r['name'], 'slug': slugify(r['name'])} for r in fetch_rooms()]
+    return render_template('rooms.html', rooms=rooms)
+
+
+@app.route('/partials/sidebar')
+@login_required
+def sidebar_fragment():
+    """Sidebar as HTML fragment for pages that defer it (`defer_sidebar`), cached per user"""
+    user = session.get('user_id')
+    index = user_data_index()
+    cached = DATA_CACHE.get(("sidebar", user))
+    if cached is None or cached[0] is not index:
+        html = render_template('sidebar.html', rooms=index.rooms, plants=index.plants)
+        cached = (index, html, hashlib.sha1(html.encode()).hexdigest())
+        DATA_CACHE.set(("sidebar", user), cached)
+    _, html, etag = cached
+    response = make_response(html, 200, {'Content-Type': 'text/html; charset=utf-8'})
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 # Plantendetail und Bearbeitung
 @app.route('/pflanze/<slug>')
 @login_required
 def plant_detail(slug):
-    plants = fetch_plants()
-    rooms = fetch_rooms()
+    index = user_data_index()
     plant = None
     plant_id_part = slug.rsplit('-', 1)[-1]
     if plant_id_part.isdigit():
-        plant = next((p for p in plants if str(p['id']) == plant_id_part), None)
+        plant = index.plants_by_id.get(plant_id_part)
     if not plant:
-        plant = next((p for p in plants if slugify(p['name']) == slug), None)
+        plant = index.plants_by_slug.get(slug)
     if not plant:
         logging.warning("Pflanzen-Detail: Pflanze mit Slug '%s' nicht gefunden für Benutzer '%s'.", slug,
                         session.get('user_id'))
         flash("Pflanze nicht gefunden.", "warning")
         return "Pflanze nicht gefunden", 404
-    return render_template('plant.html', plant=plant, rooms=rooms,
+    return render_template('plant.html', plant=plant, rooms=index.rooms,
                            trivial=plant['name'], botanisch=plant['name'])
 
 
@@ -291,19 +1901,711 @@ def update_plant_api(plant_id: int):
     # Encode the data to handle special characters properly
     encoded_data = _encode_form_data(data)
     
-    if plant_id not in PLANT_OVERRIDES:
-        PLANT_OVERRIDES[plant_id] = {}
-    PLANT_OVERRIDES[plant_id].update(encoded_data)
+    PLANT_OVERRIDES.update(plant_id, encoded_data)
     logging.info("Plant override updated for plant_id %d by user %s: %s", plant_id, session.get('user_id'), encoded_data)
     return jsonify({'success': True})
 
 
+# --- Downsampling langer Messreihen ---
+def _numeric_column(records: list, key: str) -> np.ndarray:
+    """Return the values of `key` as float array; missing or non-numeric values become NaN."""
+    return np.array([
+        value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+        for value in (record.get(key) for record in records)
+    ], dtype=float)
+
+
+def _numeric_keys(records: list) -> list:
+    """Keys of the first record holding numeric values (ids are excluded)."""
+    return [
+        key for key, value in records[0].items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and not key.endswith('_id')
+    ]
+
+
+def _bucket_ids(n: int, buckets: int) -> np.ndarray:
+    """Assign each of n samples to one of `buckets` contiguous, roughly equal sized buckets."""
+    return (np.arange(n) * buckets) // n
+
+
+def _bucket_starts(bucket_ids: np.ndarray) -> np.ndarray:
+    """Index of the first sample of each bucket."""
+    return np.flatnonzero(np.diff(bucket_ids, prepend=-1))
+
+
+def _lttb_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: keep the first and last sample and, per bucket, the sample
+    forming the largest triangle with the previously kept sample and the next bucket's mean.
+    Samples are treated as equidistant, which matches the fixed sensor reporting interval.
+    """
+    n = len(y)
+    y = np.where(np.isnan(y), np.nanmean(y) if not np.all(np.isnan(y)) else 0.0, y)
+    x = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def _minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """Keep the minimum and the maximum sample of each of threshold/2 buckets."""
+    buckets = max(threshold // 2, 1)
+    bucket_ids = _bucket_ids(len(y), buckets)
+    # Sortierung nach (Bucket, Wert): erstes Element je Bucket = Minimum, letztes = Maximum
+    order_min = np.lexsort((np.where(np.isnan(y), np.inf, y), bucket_ids))
+    order_max = np.lexsort((np.where(np.isnan(y), -np.inf, y), bucket_ids))
+    first = _bucket_starts(bucket_ids)
+    last = np.append(first[1:] - 1, len(y) - 1)
+    return np.unique(np.concatenate((order_min[first], order_max[last])))
+
+
+def _mean_buckets(records: list, threshold: int) -> list:
+    """Average all numeric fields per bucket; other fields (e.g. timestamps) come from the bucket's first sample."""
+    bucket_ids = _bucket_ids(len(records), threshold)
+    result = [dict(records[i]) for i in _bucket_starts(bucket_ids)]
+    for key in _numeric_keys(records):
+        values = _numeric_column(records, key)
+        valid = ~np.isnan(values)
+        sums = np.bincount(bucket_ids, weights=np.where(valid, values, 0.0), minlength=threshold)
+        counts = np.bincount(bucket_ids, weights=valid, minlength=threshold)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        for row, mean in zip(result, means):
+            row[key] = None if np.isnan(mean) else round(float(mean), 3)
+    return result
+
+
+DOWNSAMPLING_ALGORITHMS = ('lttb', 'minmax', 'mean')
+
+
+def downsample(records: list, max_points: int, algorithm: str = 'lttb', y_key: Optional[str] = None) -> list:
+    """
+    Reduce a list of measurement dicts to at most `max_points` entries. 'lttb' and 'minmax'
+    return a subset of the original samples selected by the `y_key` field (default: the first
+    numeric field), 'mean' returns bucket averages of all numeric fields.
+    """
+    if not records or len(records) <= max_points or max_points < 3:
+        return records
+    if algorithm == 'mean':
+        return _mean_buckets(records, max_points)
+
+    numeric_keys = _numeric_keys(records)
+    y_key = y_key or (numeric_keys[0] if numeric_keys else None)
+    if y_key is None:
+        return [records[i] for i in _bucket_starts(_bucket_ids(len(records), max_points))]
+    y = _numeric_column(records, y_key)
+    indices = _lttb_indices(y, max_points) if algorithm == 'lttb' else _minmax_indices(y, max_points)
+    return [records[i] for i in indices]
+
+
+def _downsampling_args() -> tuple:
+    """
+    Read `max_points`, `downsample` (algorithm) and `y` from the query string.
+    Raises ValueError for invalid values.
+    """
+    max_points = request.args.get('max_points')
+    algorithm = request.args.get('downsample', 'lttb')
+    if algorithm not in DOWNSAMPLING_ALGORITHMS:
+        raise ValueError(f"Unknown downsampling algorithm: {algorithm}")
+    if max_points is None:
+        return None, algorithm, request.args.get('y')
+    if not max_points.isdigit() or int(max_points) < 3:
+        raise ValueError("max_points must be an integer >= 3")
+    return int(max_points), algorithm, request.args.get('y')
+
+
+# --- Lokaler Zeitreihen-Speicher: memory-mapped Ringpuffer pro Topf und Messreihe ---
+# Messreihe -> Dateiname, Zeitfeld und -format, Messgrößen, Kapazität und angezeigter Zeitraum (Tage)
+TIMESERIES_SERIES = {
+    "/json/all-today": {
+        "name": "today", "time_key": "timestamp", "time_format": "%Y-%m-%d %H:%M:%S",
+        "fields": ("temperature", "air_humidity", "soil_moisture"), "capacity": TIMESERIES_CAPACITY, "days": 1,
+    },
+    "/json/sunlight-30days": {
+        "name": "sunlight", "time_key": "date", "time_format": "%Y-%m-%d",
+        "fields": ("sunlight_hours",), "capacity": 64, "days": 30,
+    },
+}
+
+RING_HEADER = np.dtype([('head', '<i8'), ('count', '<i8'), ('capacity', '<i8'), ('record_size', '<i8'),
+                        ('fetched_at', '<f8'), ('last_ts', '<f8')])
+
+
+class TimeSeriesRing:
+    """
+    Fixed-size ring buffer of (ts, field...) float64 rows in a memory-mapped file. Worker
+    processes map the same file and coordinate with flock; the header holds the write
+    position, the number of rows, the newest timestamp and the time of the last upstream sync.
+    """
+
+    def __init__(self, path: str, fields: tuple, capacity: int):
+        self.path = path
+        self.users = 0  # Threads, die den Ring gerade verwenden (TimeSeriesStore.ring)
+        self.evicted = False
+        self.dtype = np.dtype([('ts', '<f8')] + [(field, '<f8') for field in fields])
+        self._thread_lock = threading.Lock()
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), 'r+b')
+        size = RING_HEADER.itemsize + capacity * self.dtype.itemsize
+        with self.lock(exclusive=True):
+            header = np.fromfile(path, RING_HEADER, count=1) if os.path.getsize(path) >= RING_HEADER.itemsize else None
+            if (header is None or header[0]['capacity'] != capacity
+                    or header[0]['record_size'] != self.dtype.itemsize or os.path.getsize(path) != size):
+                # Neu anlegen (auch nach geänderter Kapazität oder Messgrößen)
+                self._file.truncate(0)
+                self._file.truncate(size)
+                fresh = np.zeros(1, RING_HEADER)
+                fresh[0]['capacity'], fresh[0]['record_size'] = capacity, self.dtype.itemsize
+                self._file.seek(0)
+                self._file.write(fresh.tobytes())
+                self._file.flush()
+            self.header = np.memmap(path, RING_HEADER, 'r+', offset=0, shape=(1,))
+            self.rows = np.memmap(path, self.dtype, 'r+', offset=RING_HEADER.itemsize, shape=(capacity,))
+
+    @contextmanager
+    def lock(self, exclusive: bool = False):
+        with self._thread_lock:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    @property
+    def fetched_at(self) -> float:
+        return float(self.header[0]['fetched_at'])
+
+    @property
+    def last_ts(self) -> Optional[float]:
+        return float(self.header[0]['last_ts']) if self.header[0]['count'] else None
+
+    def claim_refresh(self, now: float, interval: float) -> bool:
+        """
+        Mark the ring as synchronised at `now` if the last sync is at least `interval` seconds
+        old. Returns True for the single caller (thread or worker process) that has to fetch.
+        """
+        with self.lock(exclusive=True):
+            if now - self.fetched_at < interval:
+                return False
+            self.header['fetched_at'][0] = now
+            self.header.flush()
+            return True
+
+    def append(self, rows: np.ndarray, fetched_at: float) -> int:
+        """Append rows sorted by ts; a row with the newest timestamp replaces it. Call under lock()."""
+        header = self.header[0]
+        capacity, added = int(header['capacity']), 0
+        for row in rows:
+            if header['count'] and row['ts'] < header['last_ts']:
+                continue
+            if header['count'] and row['ts'] == header['last_ts']:
+                self.rows[(header['head'] - 1) % capacity] = row
+                continue
+            self.rows[header['head']] = row
+            header['head'] = (header['head'] + 1) % capacity
+            header['count'] = min(header['count'] + 1, capacity)
+            header['last_ts'] = row['ts']
+            added += 1
+        header['fetched_at'] = fetched_at
+        self.header[0] = header
+        self.rows.flush()
+        self.header.flush()
+        return added
+
+    def covers(self, since_ts: float) -> bool:
+        """False if rows newer than since_ts were already overwritten (full ring). Call under lock()."""
+        header = self.header[0]
+        if header['count'] < header['capacity']:
+            return True
+        return float(self.rows[header['head']]['ts']) <= since_ts
+
+    def read(self, since_ts: float) -> np.ndarray:
+        """Rows with ts >= since_ts, oldest first (a copy). Call under lock()."""
+        header = self.header[0]
+        capacity, count = int(header['capacity']), int(header['count'])
+        order = (int(header['head']) - count + np.arange(count)) % capacity
+        rows = np.array(self.rows[order])
+        return rows[rows['ts'] >= since_ts]
+
+    def close(self) -> None:
+        del self.header, self.rows
+        self._file.close()
+
+
+class TimeSeriesStore:
+    """
+    Opens the ring files under `directory` lazily and keeps at most `max_open` of them mapped.
+    Rings evicted while a thread still uses them are closed when it releases them.
+    """
+
+    def __init__(self, directory: str, max_open: int):
+        self.directory = directory
+        self.max_open = max_open
+        self._rings = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @contextmanager
+    def ring(self, endpoint: str, pot_id: int):
+        """Context manager yielding the pot's ring; it stays open until the block is left."""
+        ring = self._acquire(endpoint, pot_id)
+        try:
+            yield ring
+        finally:
+            self._release(ring)
+
+    def _acquire(self, endpoint: str, pot_id: int) -> TimeSeriesRing:
+        series = TIMESERIES_SERIES[endpoint]
+        key = (series["name"], int(pot_id))
+        with self._lock:
+            if self._pid != os.getpid():
+                # Nach fork() eigene Dateien und Sperren öffnen
+                self._rings, self._pid = OrderedDict(), os.getpid()
+            ring = self._rings.get(key)
+            if ring is not None:
+                self._rings.move_to_end(key)
+            else:
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, f"pot-{int(pot_id)}-{series['name']}.ring")
+                ring = self._rings[key] = TimeSeriesRing(path, series["fields"], series["capacity"])
+                while len(self._rings) > self.max_open:
+                    evicted = self._rings.popitem(last=False)[1]
+                    evicted.evicted = True
+                    if not evicted.users:
+                        evicted.close()
+            ring.users += 1
+            return ring
+
+    def _release(self, ring: TimeSeriesRing) -> None:
+        with self._lock:
+            ring.users -= 1
+            if ring.evicted and not ring.users:
+                ring.close()
+
+
+timeseries_store = TimeSeriesStore(TIMESERIES_DIR, TIMESERIES_OPEN_FILES)
+
+
+def _parse_sample_time(value, time_format: str) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.strptime(value[:19], time_format).timestamp()
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+
+
+def _records_to_rows(records: list, series: dict, dtype: np.dtype) -> np.ndarray:
+    rows = []
+    for record in records:
+        ts = _parse_sample_time(record.get(series["time_key"]), series["time_format"])
+        if ts is None:
+            continue
+        values = (_as_number(record.get(field)) for field in series["fields"])
+        rows.append((ts, *(np.nan if value is None else value for value in values)))
+    rows = np.array(rows, dtype=dtype)
+    return rows[np.argsort(rows['ts'], kind='stable')]
+
+
+def _rows_to_records(rows: np.ndarray, series: dict, pot_id: int) -> list:
+    records = []
+    for row in rows.tolist():
+        record = {"pot_id": pot_id} if series["name"] == "today" else {}
+        record[series["time_key"]] = datetime.fromtimestamp(row[0]).strftime(series["time_format"])
+        record.update({field: None if np.isnan(value) else value for field, value in zip(series["fields"], row[1:])})
+        records.append(record)
+    return records
+
+
+def _sync_series(endpoint: str, pot_id: int, ring: TimeSeriesRing, claimed_at: float) -> bool:
+    """
+    Fetch the samples newer than the newest stored one (`since`) and append them. The API
+    call runs without holding the ring lock. Returns False if the API is unavailable.
+    """
+    series = TIMESERIES_SERIES[endpoint]
+    params = {"pot_id": pot_id}
+    with ring.lock():
+        last_ts = ring.last_ts
+    if last_ts is not None:
+        params["since"] = datetime.fromtimestamp(last_ts).strftime(series["time_format"])
+    records = _make_api_request("GET", endpoint, params=params)
+    if records is None:
+        return False
+    rows = _records_to_rows(records, series, ring.dtype)
+    with ring.lock(exclusive=True):
+        ring.append(rows, claimed_at)
+    return True
+
+
+def _refresh_stored_series(endpoint: str, pot_id: int, claimed_at: float) -> None:
+    with timeseries_store.ring(endpoint, pot_id) as ring:
+        _sync_series(endpoint, pot_id, ring, claimed_at)
+
+
+def stored_series(endpoint: str, pot_id: int) -> Optional[list]:
+    """
+    Return the series from the local ring buffer, synchronised with the API at most every
+    PLANTIFY_TIMESERIES_REFRESH seconds by fetching only samples newer than the last stored
+    one (`since`). Stored data is returned right away while one caller refreshes it in the
+    background; only an empty ring is filled before returning. If the ring is too small for
+    the whole window (see PLANTIFY_TIMESERIES_CAPACITY), the full series is fetched from the
+    API instead of returning a truncated one.
+    """
+    series = TIMESERIES_SERIES[endpoint]
+    start = datetime.combine(datetime.now().date() - timedelta(days=series["days"] - 1), datetime.min.time())
+    synced = None
+    with timeseries_store.ring(endpoint, pot_id) as ring:
+        now = time.time()
+        with ring.lock():
+            stored = ring.last_ts is not None
+        # Der Abgleich wird vor dem Abruf beansprucht (fetched_at), damit nur ein Thread bzw.
+        # Worker abgleicht, auch wenn die API nicht erreichbar ist
+        if ring.claim_refresh(now, TIMESERIES_REFRESH):
+            if stored:
+                refresh_in_background(("timeseries", series["name"], int(pot_id)),
+                                      partial(_refresh_stored_series, endpoint, pot_id, now))
+            else:
+                synced = _sync_series(endpoint, pot_id, ring, now)
+        with ring.lock():
+            complete = ring.covers(start.timestamp())
+            rows = ring.read(start.timestamp())
+    if synced is False:
+        return None
+    if complete and (stored or synced):
+        return _rows_to_records(rows, series, pot_id)
+    # Ring zu klein für den Zeitraum oder noch leer, während ihn ein anderer Aufruf erstmals füllt
+    records = _make_api_request("GET", endpoint, params={"pot_id": pot_id})
+    if records is not None or not stored:
+        return records
+    logging.warning("Zeitreihe %s für Topf %s nur teilweise im Ringpuffer (Kapazität zu klein)", endpoint, pot_id)
+    return _rows_to_records(rows, series, pot_id)
+
+
+def _fetch_series(endpoint: str, pot_id: int) -> tuple:
+    """
+    Fetch a measurement series and apply the downsampling requested via the query string.
+    Returns (records, None) on success or (None, error_response) for invalid parameters.
+    """
+    try:
+        max_points, algorithm, y_key = _downsampling_args()
+    except ValueError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+    if TIMESERIES_ENABLED:
+        records = stored_series(endpoint, pot_id)
+    else:
+        records = _make_api_request("GET", endpoint, params={"pot_id": pot_id})
+    if records and max_points:
+        records = downsample(records, max_points, algorithm, y_key)
+    return records, None
+
+
+# --- Streaming-Proxy: große Antworten ohne Puffern und ohne Decode/Re-Encode durchreichen ---
+def open_upstream_stream(endpoint: str, params: Optional[dict] = None) -> Optional[requests.Response]:
+    """
+    Start a streamed GET to plantify-api. Only the headers have been read when this returns;
+    the caller must consume or close the response. Returns None on errors or an open breaker.
+    """
+    breaker = circuit_breaker(endpoint)
+    if not breaker.allow():
+        logging.warning(f"Streaming-Aufruf übersprungen, Circuit Breaker offen (GET {endpoint})")
+        record_upstream_call("GET", endpoint, "circuit_open")
+        return None
+    # Die Instanz zählt nur bis zum Eintreffen der Header als belegt; bei mehreren Instanzen
+    # wird ein fehlgeschlagener Aufruf auf einer anderen wiederholt
+    attempts = 1 + API_GET_RETRIES if len(api_balancer.backends) > 1 else 1
+    tried = []
+    for attempt in range(attempts):
+        backend = api_balancer.acquire(_affinity_key(params), exclude=tried)
+        if backend in tried:
+            time.sleep(API_RETRY_BACKOFF * 2 ** (attempt - 1))
+        tried.append(backend)
+        started = time.perf_counter()
+        try:
+            upstream = api_session.get(f"{backend.base}{endpoint}", params=params, timeout=_api_timeout(endpoint),
+                                       stream=True)
+            upstream.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            elapsed = time.perf_counter() - started
+            response = getattr(e, 'response', None)
+            if response is not None:
+                response.close()
+            healthy = response is not None and response.status_code < 500
+            api_balancer.release(backend, elapsed, healthy)
+            record_upstream_call("GET", endpoint, "error", elapsed)
+            logging.error(f"Streaming-Aufruf fehlgeschlagen (GET {backend.base}{endpoint}): {e}")
+            retryable = (isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                         or (response is not None and response.status_code in API_RETRY_STATUSES))
+            if retryable and attempt < attempts - 1:
+                continue
+            if healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            return None
+        elapsed = time.perf_counter() - started
+        breaker.record_success()
+        api_balancer.release(backend, elapsed, True)
+        record_upstream_call("GET", endpoint, "success", elapsed)
+        return upstream
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(PROXY_GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = gzip-Container
+    try:
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    finally:
+        chunks.close()  # Bei Verbindungsabbruch auch die Upstream-Verbindung freigeben
+
+
+def stream_upstream_response(upstream: requests.Response, content_type: str, on_complete=None,
+                             max_tee_bytes: int = 0) -> Response:
+    """
+    Relay a streamed upstream response chunk by chunk. Bodies the upstream already gzipped are
+    passed through untouched to clients accepting gzip, other bodies are gzipped on the fly
+    (PLANTIFY_PROXY_GZIP). With `on_complete`, the decoded body (up to `max_tee_bytes`) is
+    collected alongside; `on_complete` is called exactly once, with the body after a complete
+    transfer or with None if the transfer broke off or the body was too large.
+    """
+    accepts_gzip = 'gzip' in request.accept_encodings
+    passthrough = (on_complete is None and accepts_gzip
+                   and upstream.headers.get('Content-Encoding', '').lower() == 'gzip')
+    endpoint = urllib.parse.urlsplit(upstream.url).path
+    pending = [on_complete] if on_complete is not None else []
+
+    def complete(body: Optional[bytes]) -> None:
+        if pending:
+            pending.pop()(body)
+
+    def body():
+        if passthrough:
+            chunks = upstream.raw.stream(PROXY_CHUNK_SIZE, decode_content=False)
+        else:
+            chunks = upstream.iter_content(PROXY_CHUNK_SIZE)
+        collected, size = [], 0
+        try:
+            for chunk in chunks:
+                if pending and size <= max_tee_bytes:
+                    collected.append(chunk)
+                    size += len(chunk)
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            # Status und Header sind schon gesendet; der Client sieht eine abgebrochene Antwort
+            circuit_breaker(endpoint).record_failure()
+            logging.error(f"Streaming abgebrochen ({endpoint}): {e}")
+            return
+        finally:
+            upstream.close()
+        complete(b"".join(collected) if size <= max_tee_bytes else None)
+
+    response = _relay_response(body(), content_type, passthrough)
+    # Auch wenn der Body nie gelesen wird (Abbruch, HEAD): Verbindung freigeben, Wartende wecken
+    response.call_on_close(upstream.close)
+    response.call_on_close(lambda: complete(None))
+    return response
+
+
+def _relay_response(chunks, content_type: str, passthrough: bool = False) -> Response:
+    """Streamed 200 response for body chunks; gzipped on the fly for clients accepting it."""
+    headers = {'Content-Type': content_type, 'Vary': 'Accept-Encoding'}
+    if passthrough:
+        headers['Content-Encoding'] = 'gzip'
+    elif 'gzip' in request.accept_encodings and PROXY_GZIP:
+        chunks = _gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(chunks), 200, headers)
+
+
+class UpstreamPump:
+    """
+    Reads a streamed upstream body on a background thread into a buffer of up to `max_bytes`,
+    independent of how fast the client reads it. `on_complete` is called exactly once when the
+    upstream transfer ends: with the list of body chunks, or with None if it broke off or
+    exceeded `max_bytes`. In that case the client's iterator continues reading the rest from
+    upstream itself. At most PLANTIFY_STREAM_PUMPS pumps run at a time (see try_start).
+    """
+
+    _slots = threading.BoundedSemaphore(max(1, STREAM_PUMPS))
+
+    @classmethod
+    def try_start(cls, endpoint: str, upstream: requests.Response, max_bytes: int,
+                  on_complete) -> Optional['UpstreamPump']:
+        """Start a pump if a slot is free, otherwise return None."""
+        if not cls._slots.acquire(blocking=False):
+            return None
+        try:
+            return cls(endpoint, upstream, max_bytes, on_complete)
+        except BaseException:
+            cls._slots.release()
+            raise
+
+    def __init__(self, endpoint: str, upstream: requests.Response, max_bytes: int, on_complete):
+        self.endpoint = endpoint
+        self.upstream = upstream
+        self.max_bytes = max_bytes
+        self.on_complete = on_complete
+        self.chunks = []
+        self.size = 0
+        self.state = "running"  # running, done, overflow, failed
+        self._source = upstream.iter_content(PROXY_CHUNK_SIZE)
+        self._overflow_chunk = b""
+        self._abandoned = False
+        self._cond = threading.Condition()
+        threading.Thread(target=self._pump, name='plantify-stream-pump', daemon=True).start()
+
+    def _pump(self) -> None:
+        state = "failed"
+        try:
+            for chunk in self._source:
+                with self._cond:
+                    if self.size + len(chunk) > self.max_bytes:
+                        # Rest liest der Client selbst; ohne Client Verbindung schließen
+                        self._overflow_chunk, self.state = chunk, "overflow"
+                        if self._abandoned:
+                            self.upstream.close()
+                        self._cond.notify_all()
+                        break
+                    self.chunks.append(chunk)
+                    self.size += len(chunk)
+                    self._cond.notify_all()
+            else:
+                state = "done"
+        except requests.exceptions.RequestException as e:
+            circuit_breaker(self.endpoint).record_failure()
+            logging.error(f"Streaming abgebrochen ({self.endpoint}): {e}")
+        except Exception:
+            logging.exception(f"Fehler beim Lesen der Upstream-Antwort ({self.endpoint})")
+        finally:
+            with self._cond:
+                if self.state != "overflow":
+                    self.state = state
+                    self.upstream.close()
+                self._cond.notify_all()
+        try:
+            self.on_complete(self.chunks if state == "done" else None)
+        finally:
+            UpstreamPump._slots.release()
+
+    def iter_chunks(self):
+        """The body for the client: buffered chunks as they arrive, then any overflow directly."""
+        position = 0
+        try:
+            while True:
+                with self._cond:
+                    while position == len(self.chunks) and self.state == "running":
+                        self._cond.wait()
+                    chunks, state = self.chunks[position:], self.state
+                position += len(chunks)
+                yield from chunks
+                if state != "running":
+                    break
+            if state == "overflow":
+                yield self._overflow_chunk
+                try:
+                    yield from self._source
+                except requests.exceptions.RequestException as e:
+                    circuit_breaker(self.endpoint).record_failure()
+                    logging.error(f"Streaming abgebrochen ({self.endpoint}): {e}")
+        finally:
+            self.abandon()
+
+    def abandon(self) -> None:
+        """The client is gone; the pump keeps filling the buffer for waiting requests."""
+        with self._cond:
+            self._abandoned = True
+            if self.state == "overflow":
+                self.upstream.close()
+
+
+def proxy_upstream_stream(endpoint: str, params: dict, content_type: str, on_complete=None,
+                          max_tee_bytes: int = COALESCE_MAX_BYTES) -> Optional[Response]:
+    """
+    Stream an upstream GET to the client (see stream_upstream_response). Requests for the same
+    endpoint and params arriving before the upstream headers wait for the transfer and get its
+    body instead of calling the API again; the body is then read by an UpstreamPump, so they
+    depend only on the upstream transfer, not on how fast the first client reads. Without
+    waiters the body is streamed straight through. Returns None if the upstream call failed.
+    """
+    if not COALESCE_REQUESTS:
+        upstream = open_upstream_stream(endpoint, params)
+        if upstream is None:
+            return None
+        return stream_upstream_response(upstream, content_type, on_complete, max_tee_bytes)
+
+    key = ("stream", endpoint, json.dumps(params, sort_keys=True, default=str))
+    flight, leader = upstream_flights.begin(key)
+    if not leader:
+        if flight.done.wait(_api_timeout(endpoint)[1]) and flight.result is not None:
+            metrics.inc("plantify_upstream_coalesced_total", (("endpoint", endpoint),))
+            return Response(flight.result, 200, {'Content-Type': content_type})
+        # Vorgänger fehlgeschlagen, zu groß oder zu langsam: selbst abrufen
+        upstream = open_upstream_stream(endpoint, params)
+        if upstream is None:
+            return None
+        return stream_upstream_response(upstream, content_type, on_complete, max_tee_bytes)
+
+    upstream = open_upstream_stream(endpoint, params)
+    if upstream is None:
+        upstream_flights.finish(key, flight)
+        return None
+    if upstream_flights.detach_unwatched(key, flight):
+        # Niemand wartet: ohne Mitschnitt (und gzip ggf. unverändert) durchreichen
+        upstream_flights.finish(key, flight)
+        return stream_upstream_response(upstream, content_type, on_complete, max_tee_bytes)
+
+    def share(chunks: Optional[list]) -> None:
+        try:
+            if on_complete is not None:
+                on_complete(None if chunks is None else b"".join(chunks))
+        finally:
+            upstream_flights.finish(key, flight, chunks)
+
+    pump = UpstreamPump.try_start(endpoint, upstream, max_tee_bytes, share)
+    if pump is None:
+        # Alle Pumpen belegt: im Request selbst mitschneiden (Wartende hängen dann am Client-Tempo)
+        return stream_upstream_response(upstream, content_type, lambda body: share(None if body is None else [body]),
+                                        max_tee_bytes)
+    response = _relay_response(pump.iter_chunks(), content_type)
+    response.call_on_close(pump.abandon)
+    return response
+
+
+def _needs_series_transform() -> bool:
+    # Mit lokalem Zeitreihen-Speicher wird aus diesem bedient statt durchgereicht
+    return TIMESERIES_ENABLED or request.args.get('max_points') is not None
+
+
 # --- Data Visualization Endpoints ---
 @app.route('/api/data/all-today/<int:pot_id>')
 @login_required
 def get_all_today(pot_id: int):
-    """Get all values for today for a specific pot"""
-    response_data = _make_api_request("GET", "/json/all-today", params={"pot_id": pot_id})
+    """Get all values for today for a specific pot (optionally downsampled via ?max_points=)"""
+    if not _needs_series_transform():
+        response = proxy_upstream_stream("/json/all-today", {"pot_id": pot_id}, 'application/json')
+        return response if response is not None else (jsonify([]), 404)
+    response_data, error = _fetch_series("/json/all-today", pot_id)
+    if error:
+        return error
     if response_data:
         return jsonify(response_data)
     return jsonify([]), 404
@@ -312,48 +2614,556 @@ def get_all_today(pot_id: int):
 @app.route('/api/data/sunlight-30days/<int:pot_id>')
 @login_required
 def get_sunlight_30days(pot_id: int):
-    """Get sunlight data for the last 30 days for a specific pot"""
-    response_data = _make_api_request("GET", "/json/sunlight-30days", params={"pot_id": pot_id})
+    """Get sunlight data for the last 30 days for a specific pot (optionally downsampled via ?max_points=)"""
+    if not _needs_series_transform():
+        response = proxy_upstream_stream("/json/sunlight-30days", {"pot_id": pot_id}, 'application/json')
+        return response if response is not None else (jsonify([]), 404)
+    response_data, error = _fetch_series("/json/sunlight-30days", pot_id)
+    if error:
+        return error
     if response_data:
         return jsonify(response_data)
     return jsonify([]), 404
 
 
+def _to_columnar(records: list) -> dict:
+    """
+    Convert a list of measurement dicts into one list per field (columnar layout),
+    which is considerably smaller as JSON and maps directly onto Plotly traces.
+    """
+    columns = {}
+    for index, record in enumerate(records):
+        for key in record:
+            if key not in columns:
+                columns[key] = [None] * index
+        for key, values in columns.items():
+            values.append(record.get(key))
+    return columns
+
+
+@app.route('/api/series/all-today/<int:pot_id>')
+@login_required
+def get_all_today_series(pot_id: int):
+    """Get today's values for a specific pot as columnar time series"""
+    response_data, error = _fetch_series("/json/all-today", pot_id)
+    if error:
+        return error
+    if response_data:
+        return jsonify({"pot_id": pot_id, "length": len(response_data), "columns": _to_columnar(response_data)})
+    return jsonify({"pot_id": pot_id, "length": 0, "columns": {}}), 404
+
+
+@app.route('/api/series/sunlight-30days/<int:pot_id>')
+@login_required
+def get_sunlight_30days_series(pot_id: int):
+    """Get sunlight data for the last 30 days for a specific pot as columnar time series"""
+    response_data, error = _fetch_series("/json/sunlight-30days", pot_id)
+    if error:
+        return error
+    if response_data:
+        return jsonify({"pot_id": pot_id, "length": len(response_data), "columns": _to_columnar(response_data)})
+    return jsonify({"pot_id": pot_id, "length": 0, "columns": {}}), 404
+
+
 @app.route('/api/data/latest-value/<int:pot_id>')
 @login_required
 def get_latest_value(pot_id: int):
     """Get the latest value for a specific pot"""
-    response_data = _make_api_request("GET", "/json/latest-value", params={"pot_id": pot_id})
+    response_data = latest_values_for([pot_id])[pot_id]
     if response_data:
         return jsonify(response_data)
     return jsonify({}), 404
 
 
+def _parse_pot_ids(values: list) -> Optional[list]:
+    """
+    Parse pot ids given as comma separated and/or repeated query parameters.
+    Returns the unique ids in request order, or None if any id is not an integer.
+    """
+    pot_ids = []
+    for value in values:
+        for part in value.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if not part.isdigit():
+                return None
+            pot_id = int(part)
+            if pot_id not in pot_ids:
+                pot_ids.append(pot_id)
+    return pot_ids
+
+
+@app.route('/api/data/latest-values')
+@login_required
+def get_latest_values():
+    """Get the latest values for several pots (?pot_id=1,2,3) in one request"""
+    pot_ids = _parse_pot_ids(request.args.getlist('pot_id'))
+    if not pot_ids:
+        return jsonify({'error': 'Missing or invalid pot_id parameter'}), 400
+    if len(pot_ids) > LATEST_VALUES_BATCH_LIMIT:
+        return jsonify({'error': f'Too many pot_ids (max. {LATEST_VALUES_BATCH_LIMIT})'}), 400
+
+    results = latest_values_for(pot_ids)
+    return jsonify({str(pot_id): results[pot_id] or None for pot_id in pot_ids})
+
+
+# --- Live-Updates (Server-Sent Events) ---
+class LatestValueHub:
+    """
+    Polls the latest values of all pots watched by any connected viewer, once per pot and
+    interval, and lets every viewer wait for changes of its own pots. The poller thread
+    starts with the first subscription and stops when the last viewer disconnects.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._watchers = {}  # pot_id -> Anzahl Zuschauer
+        self._values = {}  # pot_id -> (version, value)
+        self._version = 0
+        self._cond = threading.Condition()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def subscribe(self, pot_ids: list) -> None:
+        with self._cond:
+            for pot_id in pot_ids:
+                self._watchers[pot_id] = self._watchers.get(pot_id, 0) + 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='plantify-live-values', daemon=True)
+                self._thread.start()
+        self._wakeup.set()  # Neue Töpfe sofort abfragen
+
+    def unsubscribe(self, pot_ids: list) -> None:
+        with self._cond:
+            for pot_id in pot_ids:
+                remaining = self._watchers.get(pot_id, 0) - 1
+                if remaining > 0:
+                    self._watchers[pot_id] = remaining
+                else:
+                    self._watchers.pop(pot_id, None)
+                    self._values.pop(pot_id, None)
+
+    def wait_for_changes(self, pot_ids: list, since: int, timeout: float) -> tuple:
+        """
+        Block until values newer than version `since` exist (or `timeout` expires) and return
+        (current version, {pot_id: value}) containing only the given pots that changed.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._version > since, timeout)
+            changes = {
+                pot_id: self._values[pot_id][1]
+                for pot_id in pot_ids
+                if pot_id in self._values and self._values[pot_id][0] > since
+            }
+            return self._version, changes
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                pot_ids = list(self._watchers)
+                if not pot_ids:
+                    self._thread = None
+                    return
+            self._wakeup.clear()
+            try:
+                self._poll(pot_ids)
+            except Exception:
+                logging.exception("Fehler beim Abfragen der aktuellen Messwerte für Live-Updates")
+            self._wakeup.wait(self.interval)
+
+    def _poll(self, pot_ids: list) -> None:
+        results = _fetch_latest_values(pot_ids)
+        _store_latest_values(results)
+        with self._cond:
+            version = self._version + 1
+            for pot_id, value in results.items():
+                if value is None or pot_id not in self._watchers:
+                    continue
+                if pot_id not in self._values or self._values[pot_id][1] != value:
+                    self._values[pot_id] = (version, value)
+                    self._version = version
+            self._cond.notify_all()
+
+
+latest_value_hub = LatestValueHub(STREAM_POLL_INTERVAL)
+
+
+@app.route('/api/stream/latest-values')
+@login_required
+def stream_latest_values():
+    """Stream changes of the latest values for several pots (?pot_id=1,2,3) as Server-Sent Events"""
+    if not LIVE_UPDATES:
+        return jsonify({'error': 'Live updates are disabled'}), 404
+    pot_ids = _parse_pot_ids(request.args.getlist('pot_id'))
+    if not pot_ids:
+        return jsonify({'error': 'Missing or invalid pot_id parameter'}), 400
+    if len(pot_ids) > LATEST_VALUES_BATCH_LIMIT:
+        return jsonify({'error': f'Too many pot_ids (max. {LATEST_VALUES_BATCH_LIMIT})'}), 400
+
+    def generate():
+        latest_value_hub.subscribe(pot_ids)
+        try:
+            version = 0
+            yield f"retry: {int(STREAM_POLL_INTERVAL * 1000)}\n\n"
+            while True:
+                version, changes = latest_value_hub.wait_for_changes(pot_ids, version, STREAM_HEARTBEAT)
+                if changes:
+                    data = json.dumps({str(pot_id): value for pot_id, value in changes.items()})
+                    yield f"event: latest-values\ndata: {data}\n\n"
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            latest_value_hub.unsubscribe(pot_ids)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# --- Rollierende Statistiken und Abweichungs-Alarme ---
+# Messgröße im Messwert -> Sollwert-Feld der Pflanze
+STAT_METRICS = {
+    'temperature': 'target_temperature',
+    'air_humidity': 'target_air_humidity',
+    'soil_moisture': 'target_ground_humidity',
+}
+
+
+def _as_number(value) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(number) else number
+
+
+class PotStatistics:
+    """
+    Rolling statistics of one pot in fixed time buckets (a ring of STATS_RETENTION /
+    STATS_BUCKET_SECONDS slots per metric): min, max, sum, count and the time spent outside
+    the target range. Samples are folded in by measurement time (older than the newest one
+    are ignored), windows are summed on demand.
+    """
+
+    def __init__(self, bucket_seconds: int, retention: int):
+        self.bucket_seconds = bucket_seconds
+        slots = max(1, retention // bucket_seconds)
+        shape = (len(STAT_METRICS), slots)
+        self.bucket_ids = np.full(slots, -1, dtype=np.int64)
+        self.mins = np.full(shape, np.inf)
+        self.maxs = np.full(shape, -np.inf)
+        self.sums = np.zeros(shape)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.outside = np.zeros(shape)  # Sekunden außerhalb des Sollbereichs
+        self.last_sample_at = None
+        self.latest = {}  # Messgröße -> letzter Wert
+        self.outside_since = {}  # Messgröße -> Zeitpunkt, seit dem der Wert außerhalb liegt
+
+    def add(self, at: float, values: dict, targets: dict) -> None:
+        if self.last_sample_at is not None and at < self.last_sample_at:
+            return
+        bucket = int(at // self.bucket_seconds)
+        slot = bucket % len(self.bucket_ids)
+        if self.bucket_ids[slot] != bucket:
+            self.bucket_ids[slot] = bucket
+            self.mins[:, slot], self.maxs[:, slot] = np.inf, -np.inf
+            self.sums[:, slot], self.counts[:, slot], self.outside[:, slot] = 0, 0, 0
+        # Zeit seit dem letzten Messwert zählt als Dauer des vorherigen Zustands, Lücken höchstens
+        # mit einem Bucket
+        elapsed = 0.0 if self.last_sample_at is None else min(max(0.0, at - self.last_sample_at),
+                                                              self.bucket_seconds)
+        for i, metric in enumerate(STAT_METRICS):
+            value = _as_number(values.get(metric))
+            if value is None:
+                continue
+            if self.outside_since.get(metric) is not None:
+                self.outside[i, slot] += elapsed
+            self.mins[i, slot] = min(self.mins[i, slot], value)
+            self.maxs[i, slot] = max(self.maxs[i, slot], value)
+            self.sums[i, slot] += value
+            self.counts[i, slot] += 1
+            self.latest[metric] = value
+            target = targets.get(metric)
+            if target is not None and abs(value - target) > ALERT_TOLERANCES[metric]:
+                self.outside_since.setdefault(metric, at)
+            else:
+                self.outside_since.pop(metric, None)
+        self.last_sample_at = at
+
+    def summary(self, now: float, window: int) -> dict:
+        first_bucket = int(now // self.bucket_seconds) - max(1, window // self.bucket_seconds) + 1
+        mask = self.bucket_ids >= first_bucket
+        stats = {}
+        for i, metric in enumerate(STAT_METRICS):
+            count = int(self.counts[i, mask].sum())
+            seconds_outside = float(self.outside[i, mask].sum())
+            stats[metric] = {
+                'count': count,
+                'min': float(self.mins[i, mask].min()) if count else None,
+                'max': float(self.maxs[i, mask].max()) if count else None,
+                'mean': round(float(self.sums[i, mask].sum()) / count, 3) if count else None,
+                'seconds_outside_target': round(seconds_outside, 1),
+                'fraction_outside_target': round(seconds_outside / window, 4),
+            }
+        return stats
+
+
+class StatsEngine:
+    """
+    Per-pot rolling statistics, fed from the pots' measurement series (see update_pot_stats),
+    plus the target values used to detect deviations. Only pots registered via set_targets
+    (the users' plants) are tracked: at most `max_pots`, the least recently used are dropped
+    first, as are pots unused for `idle_ttl` seconds.
+    Pot ids follow the latest-value convention of the dashboard (one pot per plant id).
+    """
+
+    def __init__(self, bucket_seconds: int, retention: int, max_pots: int, idle_ttl: float):
+        self.bucket_seconds = bucket_seconds
+        self.retention = retention
+        self.max_pots = max_pots
+        self.idle_ttl = idle_ttl
+        self._pots = {}  # pot_id -> PotStatistics
+        self._targets = OrderedDict()  # pot_id -> {Messgröße: Sollwert}, zuletzt verwendete am Ende
+        self._used_at = {}  # pot_id -> letzte Verwendung (time.monotonic)
+        self._lock = threading.Lock()
+
+    def _touch(self, pot_id) -> None:
+        """Mark a tracked pot as used and drop surplus or idle pots. Call under _lock."""
+        now = time.monotonic()
+        self._targets.move_to_end(pot_id)
+        self._used_at[pot_id] = now
+        while self._targets:
+            oldest = next(iter(self._targets))
+            if len(self._targets) <= self.max_pots and now - self._used_at[oldest] <= self.idle_ttl:
+                break
+            del self._targets[oldest]
+            self._used_at.pop(oldest, None)
+            self._pots.pop(oldest, None)
+
+    def set_targets(self, plants: list) -> None:
+        with self._lock:
+            for plant in plants:
+                self._targets[plant['id']] = {
+                    metric: _as_number(plant.get(target_key)) for metric, target_key in STAT_METRICS.items()
+                }
+                self._touch(plant['id'])
+        if ALERTS_ENABLED:
+            alert_scheduler.start()
+
+    def tracked_pots(self) -> list:
+        with self._lock:
+            return list(self._targets)
+
+    def is_tracked(self, pot_id) -> bool:
+        with self._lock:
+            return pot_id in self._targets
+
+    def last_sample_at(self, pot_id) -> Optional[float]:
+        with self._lock:
+            stats = self._pots.get(pot_id)
+            return stats.last_sample_at if stats is not None else None
+
+    def add_samples(self, pot_id, records) -> int:
+        """
+        Fold in the records of a measurement series (all-today) newer than the last one seen,
+        by their `timestamp`. Records of untracked pots are ignored. Returns the number added.
+        """
+        series = TIMESERIES_SERIES["/json/all-today"]
+        samples = []
+        for record in records or ():
+            if isinstance(record, dict):
+                measured_at = _parse_sample_time(record.get(series["time_key"]), series["time_format"])
+                if measured_at is not None:
+                    samples.append((measured_at, record))
+        samples.sort(key=lambda sample: sample[0])
+        with self._lock:
+            if pot_id not in self._targets:
+                return 0
+            self._touch(pot_id)
+            stats = self._pots.get(pot_id)
+            if stats is None:
+                stats = self._pots[pot_id] = PotStatistics(self.bucket_seconds, self.retention)
+            added = 0
+            for measured_at, record in samples:
+                if stats.last_sample_at is not None and measured_at <= stats.last_sample_at:
+                    continue
+                stats.add(measured_at, record, self._targets[pot_id])
+                added += 1
+            return added
+
+    def summary(self, pot_id, windows=STATS_WINDOWS) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            stats = self._pots.get(pot_id)
+            if stats is None:
+                return None
+            self._touch(pot_id)
+            return {
+                'pot_id': pot_id,
+                'targets': self._targets.get(pot_id, {}),
+                'latest': dict(stats.latest),
+                'windows': {str(window): stats.summary(now, window) for window in windows},
+            }
+
+    def alerts(self, pot_ids=None, now: Optional[float] = None) -> list:
+        """Deviations lasting at least ALERT_MIN_DURATION for the given pots (default: all)."""
+        now = time.time() if now is None else now
+        result = []
+        with self._lock:
+            for pot_id in (self._pots if pot_ids is None else pot_ids):
+                stats = self._pots.get(pot_id)
+                if stats is None:
+                    continue
+                targets = self._targets.get(pot_id, {})
+                for metric, since in stats.outside_since.items():
+                    if now - since < ALERT_MIN_DURATION:
+                        continue
+                    value, target = stats.latest.get(metric), targets.get(metric)
+                    if value is None or target is None:
+                        continue
+                    result.append({
+                        'pot_id': pot_id,
+                        'metric': metric,
+                        'value': value,
+                        'target': target,
+                        'tolerance': ALERT_TOLERANCES[metric],
+                        'direction': 'above' if value > target else 'below',
+                        'since': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(since)),
+                        'duration_seconds': round(now - since),
+                    })
+        return result
+
+
+class AlertScheduler:
+    """
+    Background thread that feeds the new samples of all tracked pots into the statistics every
+    ALERT_INTERVAL seconds and logs alerts when they are raised or cleared.
+    Started with the first known pots when PLANTIFY_ALERTS=1.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._thread = None
+        self._active = set()  # (pot_id, Messgröße) der zuletzt gemeldeten Alarme
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='plantify-alerts', daemon=True)
+                self._thread.start()
+
+    def run_once(self) -> list:
+        run_concurrently({pot_id: partial(update_pot_stats, pot_id) for pot_id in stats_engine.tracked_pots()},
+                         _bulk_executor)
+        alerts = stats_engine.alerts()
+        active = {(alert['pot_id'], alert['metric']) for alert in alerts}
+        for alert in alerts:
+            if (alert['pot_id'], alert['metric']) not in self._active:
+                logging.warning("Alarm: Topf %s, %s %.1f %s Sollwert %.1f (±%.1f) seit %s", alert['pot_id'],
+                                alert['metric'], alert['value'], 'über' if alert['direction'] == 'above' else 'unter',
+                                alert['target'], alert['tolerance'], alert['since'])
+        for pot_id, metric in self._active - active:
+            logging.info("Alarm aufgehoben: Topf %s, %s", pot_id, metric)
+        self._active = active
+        return alerts
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                logging.exception("Fehler bei der Auswertung der Abweichungs-Alarme")
+            time.sleep(self.interval)
+
+
+stats_engine = StatsEngine(STATS_BUCKET_SECONDS, STATS_RETENTION, STATS_MAX_POTS, STATS_IDLE_TTL)
+alert_scheduler = AlertScheduler(ALERT_INTERVAL)
+
+
+def update_pot_stats(pot_id: int) -> None:
+    """Feed the samples of the pot's series (all-today) newer than the last one seen into the statistics."""
+    endpoint = "/json/all-today"
+    if TIMESERIES_ENABLED:
+        records = stored_series(endpoint, pot_id)
+    else:
+        params = {"pot_id": pot_id}
+        last_sample_at = stats_engine.last_sample_at(pot_id)
+        if last_sample_at is not None:
+            params["since"] = datetime.fromtimestamp(last_sample_at).strftime(TIMESERIES_SERIES[endpoint]["time_format"])
+        records = _make_api_request("GET", endpoint, params=params)
+    stats_engine.add_samples(pot_id, records)
+AVERAGE_MTD_CACHE = TTLCache(DATA_CACHE_MAXSIZE, AVERAGE_MTD_TTL, name="average_mtd")
+
+
+@app.route('/api/stats/<int:pot_id>')
+@login_required
+def get_pot_stats(pot_id: int):
+    """Rolling min/max/mean and time outside the target range for a pot (?window=seconds, repeatable)"""
+    windows = request.args.getlist('window', type=int) or STATS_WINDOWS
+    if any(window <= 0 or window > STATS_RETENTION for window in windows):
+        return jsonify({'error': f'window must be between 1 and {STATS_RETENTION} seconds'}), 400
+    plant = user_data_index().plants_by_id.get(str(pot_id))
+    if plant is None:
+        return jsonify({'error': 'Pot not found'}), 404
+    if not stats_engine.is_tracked(pot_id):
+        stats_engine.set_targets([plant])  # Wegen Leerlauf verworfen: wieder aufnehmen
+    update_pot_stats(pot_id)
+    summary = stats_engine.summary(pot_id, windows)
+    if summary is None:
+        return jsonify({}), 404
+    return jsonify(summary)
+
+
+@app.route('/api/alerts')
+@login_required
+def get_alerts():
+    """Active target deviations of the current user's pots"""
+    pot_ids = [plant['id'] for plant in user_data_index().plants]
+    return jsonify({'alerts': stats_engine.alerts(pot_ids), 'enabled': ALERTS_ENABLED})
+
+
 @app.route('/api/data/average-mtd/<int:pot_id>')
 @login_required
 def get_average_mtd(pot_id: int):
     """Get average measurements month-to-date for a specific pot"""
-    response_data = _make_api_request("GET", "/json/average-mtd", params={"pot_id": pot_id})
+    response_data = AVERAGE_MTD_CACHE.get(pot_id)
+    if response_data is None:
+        response_data = _make_api_request("GET", "/json/average-mtd", params={"pot_id": pot_id})
+        if response_data:
+            AVERAGE_MTD_CACHE.set(pot_id, response_data)
     if response_data:
         return jsonify(response_data)
     return jsonify({}), 404
 
 
 # --- Plant Management Endpoints ---
+PLANT_REQUIRED_FIELDS = ('name', 'description', 'irrigation_cycle_days', 'target_temperature_celsius',
+                         'target_sunlight_hours', 'target_air_humidity_percent', 'target_soil_moisture_percent')
+
+
+def _missing_field(data: dict, required_fields) -> Optional[str]:
+    """Return the first required field missing from `data`, or None."""
+    for field in required_fields:
+        if field not in data:
+            return field
+    return None
+
+
 @app.route('/api/plants', methods=['POST'])
 @login_required
+@invalidates_user_data
 def create_plant():
     """Create a new plant profile"""
     data = request.get_json(silent=True) or {}
     encoded_data = _encode_form_data(data)
     
     # Validate required fields
-    required_fields = ['name', 'description', 'irrigation_cycle_days', 'target_temperature_celsius', 
-                      'target_sunlight_hours', 'target_air_humidity_percent', 'target_soil_moisture_percent']
-    
-    for field in required_fields:
-        if field not in encoded_data:
-            return jsonify({'error': f'Missing required field: {field}'}), 400
+    missing = _missing_field(encoded_data, PLANT_REQUIRED_FIELDS)
+    if missing:
+        return jsonify({'error': f'Missing required field: {missing}'}), 400
     
     response_data = _make_api_request("POST", "/insert/insert-plant", data=encoded_data)
     if response_data:
@@ -364,6 +3174,7 @@ def create_plant():
 
 @app.route('/api/plants/<int:plant_id>', methods=['DELETE'])
 @login_required
+@invalidates_user_data
 def delete_plant(plant_id: int):
     """Delete a plant profile"""
     response_data = _make_api_request("DELETE", "/delete/delete-plant", data={"plant_id": plant_id})
@@ -376,6 +3187,7 @@ def delete_plant(plant_id: int):
 # --- Pot Management Endpoints ---
 @app.route('/api/pots/<int:pot_id>', methods=['PATCH'])
 @login_required
+@invalidates_user_data
 def update_pot(pot_id: int):
     """Update pot name"""
     data = request.get_json(silent=True) or {}
@@ -394,6 +3206,7 @@ def update_pot(pot_id: int):
 
 @app.route('/api/pots/<int:pot_id>', methods=['DELETE'])
 @login_required
+@invalidates_user_data
 def delete_pot(pot_id: int):
     """Delete a pot"""
     response_data = _make_api_request("DELETE", "/delete/delete-pot", data={"pot_id": pot_id})
@@ -406,6 +3219,7 @@ def delete_pot(pot_id: int):
 # --- User-Pot Assignment Endpoints ---
 @app.route('/api/user-pot-assignments', methods=['POST'])
 @login_required
+@invalidates_user_data
 def create_user_pot_assignment():
     """Assign a pot to a user"""
     data = request.get_json(silent=True) or {}
@@ -424,6 +3238,7 @@ def create_user_pot_assignment():
 
 @app.route('/api/user-pot-assignments/<int:pot_id>/<int:user_id>', methods=['DELETE'])
 @login_required
+@invalidates_user_data
 def delete_user_pot_assignment(pot_id: int, user_id: int):
     """Remove pot assignment from user"""
     response_data = _make_api_request("DELETE", "/delete/delete-user_pot_assignment", 
@@ -438,6 +3253,7 @@ def delete_user_pot_assignment(pot_id: int, user_id: int):
 # --- Plant-Pot Assignment Endpoints ---
 @app.route('/api/plant-pot-assignments', methods=['POST'])
 @login_required
+@invalidates_user_data
 def create_plant_pot_assignment():
     """Assign a plant to a pot"""
     data = request.get_json(silent=True) or {}
@@ -456,6 +3272,7 @@ def create_plant_pot_assignment():
 
 @app.route('/api/plant-pot-assignments/<int:pot_id>/<int:plant_id>', methods=['DELETE'])
 @login_required
+@invalidates_user_data
 def delete_plant_pot_assignment(pot_id: int, plant_id: int):
     """Remove plant assignment from pot (soft delete)"""
     response_data = _make_api_request("DELETE", "/delete/delete-plant_pot_assignment", 
@@ -467,6 +3284,144 @@ def delete_plant_pot_assignment(pot_id: int, plant_id: int):
     return jsonify({'error': 'Failed to delete plant-pot assignment'}), 500
 
 
+# --- Sammel-Endpunkte: viele Einträge pro Request, Upstream-Aufrufe parallel ---
+def _bulk_payloads(items, list_key: str, required_fields, id_fields=()) -> tuple:
+    """
+    Validate all items of a bulk request before anything is sent upstream.
+    Fields in `id_fields` must be integers (bare ids are accepted for a single id field).
+    Returns (payloads, None) or (None, error_response).
+    """
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({'error': f'Expected a non-empty list in field: {list_key}'}), 400)
+    if len(items) > BULK_MAX_ITEMS:
+        return None, (jsonify({'error': f'Too many items (max {BULK_MAX_ITEMS})'}), 400)
+
+    payloads, errors = [], []
+    for index, item in enumerate(items):
+        if len(id_fields) == 1 and isinstance(item, (int, str)) and not isinstance(item, bool):
+            item = {id_fields[0]: item}
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'error': 'Item must be an object'})
+            continue
+        payload = _encode_form_data(item)
+        missing = _missing_field(payload, required_fields)
+        if missing:
+            errors.append({'index': index, 'error': f'Missing required field: {missing}'})
+            continue
+        invalid = [field for field in id_fields if not str(payload[field]).isdigit()]
+        if invalid:
+            errors.append({'index': index, 'error': f'Field must be an integer: {invalid[0]}'})
+            continue
+        payload.update({field: int(payload[field]) for field in id_fields})
+        payloads.append(payload)
+    if errors:
+        return None, (jsonify({'error': 'Validation failed, nothing was changed', 'items': errors}), 400)
+    return payloads, None
+
+
+def run_bulk_operation(action: str, method: str, endpoint: str, payloads: list):
+    """
+    Send one upstream call per payload on the bounded bulk pool and report per-item results.
+    Status: 200 if all succeeded, 207 if some failed, 502 if all failed.
+    """
+    responses = run_concurrently({
+        index: partial(_make_api_request, method, endpoint, data=payload)
+        for index, payload in enumerate(payloads)
+    }, executor=_bulk_executor)
+    results = [
+        {'index': index, 'success': True, 'data': responses[index]} if responses[index]
+        else {'index': index, 'success': False, 'error': f'Failed to {action}'}
+        for index in range(len(payloads))
+    ]
+    succeeded = sum(1 for result in results if result['success'])
+    logging.info("Bulk '%s' by user %s: %d ok, %d failed", action, session.get('user_id'), succeeded,
+                 len(results) - succeeded)
+    if succeeded == len(results):
+        status = 200
+    else:
+        status = 207 if succeeded else 502
+    return jsonify({'results': results, 'succeeded': succeeded, 'failed': len(results) - succeeded}), status
+
+
+def bulk_endpoint(action: str, method: str, endpoint: str, list_key: str, required_fields, id_fields=(),
+                  items=None):
+    """Validate the items (default: `list_key` of the JSON body) and run the bulk operation."""
+    if items is None:
+        items = (request.get_json(silent=True) or {}).get(list_key)
+    payloads, error = _bulk_payloads(items, list_key, required_fields, id_fields)
+    if error:
+        return error
+    return run_bulk_operation(action, method, endpoint, payloads)
+
+
+@app.route('/api/plants/bulk', methods=['POST'])
+@login_required
+@invalidates_user_data
+def create_plants_bulk():
+    """Create several plant profiles: {"plants": [{...}, ...]}"""
+    return bulk_endpoint("create plant", "POST", "/insert/insert-plant", "plants", PLANT_REQUIRED_FIELDS)
+
+
+@app.route('/api/plants/bulk', methods=['DELETE'])
+@login_required
+@invalidates_user_data
+def delete_plants_bulk():
+    """Delete several plant profiles: {"plants": [plant_id, ...]}"""
+    return bulk_endpoint("delete plant", "DELETE", "/delete/delete-plant", "plants", ('plant_id',), ('plant_id',))
+
+
+@app.route('/api/pots/bulk', methods=['PATCH'])
+@login_required
+@invalidates_user_data
+def update_pots_bulk():
+    """Rename several pots: {"pots": [{"pot_id": ..., "pot_name": ...}, ...]}"""
+    return bulk_endpoint("update pot", "PATCH", "/update/update-pot", "pots", ('pot_id', 'pot_name'), ('pot_id',))
+
+
+@app.route('/api/pots/bulk', methods=['DELETE'])
+@login_required
+@invalidates_user_data
+def delete_pots_bulk():
+    """Delete several pots: {"pots": [pot_id, ...]}"""
+    return bulk_endpoint("delete pot", "DELETE", "/delete/delete-pot", "pots", ('pot_id',), ('pot_id',))
+
+
+@app.route('/api/user-pot-assignments/bulk', methods=['POST', 'DELETE'])
+@login_required
+@invalidates_user_data
+def user_pot_assignments_bulk():
+    """Assign pots to users (POST) or remove the assignments (DELETE): {"assignments": [{pot_id, user_id}]}"""
+    if request.method == 'POST':
+        action, method, endpoint = "create user-pot assignment", "POST", "/insert/insert-user_pot_assignment"
+    else:
+        action, method, endpoint = "delete user-pot assignment", "DELETE", "/delete/delete-user_pot_assignment"
+    return bulk_endpoint(action, method, endpoint, "assignments", ('pot_id', 'user_id'), ('pot_id', 'user_id'))
+
+
+@app.route('/api/plant-pot-assignments/bulk', methods=['POST', 'DELETE'])
+@login_required
+@invalidates_user_data
+def plant_pot_assignments_bulk():
+    """
+    Assign plants to pots (POST) or remove the assignments (DELETE). Accepts explicit pairs
+    {"assignments": [{pot_id, plant_id}]} or all combinations {"pot_ids": [...], "plant_ids": [...]}.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('assignments')
+    if items is None and isinstance(data.get('pot_ids'), list) and isinstance(data.get('plant_ids'), list):
+        # Grenze vor dem Aufbau des Kreuzprodukts prüfen
+        if len(data['pot_ids']) * len(data['plant_ids']) > BULK_MAX_ITEMS:
+            return jsonify({'error': f'Too many items (max {BULK_MAX_ITEMS})'}), 400
+        items = [{'pot_id': pot_id, 'plant_id': plant_id}
+                 for pot_id in data['pot_ids'] for plant_id in data['plant_ids']]
+    if request.method == 'POST':
+        action, method, endpoint = "create plant-pot assignment", "POST", "/insert/insert-plant_pot_assignment"
+    else:
+        action, method, endpoint = "delete plant-pot assignment", "DELETE", "/delete/delete-plant_pot_assignment"
+    return bulk_endpoint(action, method, endpoint, "assignments", ('pot_id', 'plant_id'), ('pot_id', 'plant_id'),
+                         items=items)
+
+
 # --- User Management Endpoints ---
 @app.route('/api/users/<user_mail>', methods=['DELETE'])
 @login_required
@@ -487,6 +3442,32 @@ def delete_user(user_mail: str):
 
 
 # --- Plot Endpoints (Proxy to API) ---
+def _pot_data_version(pot_id) -> str:
+    """
+    Return a token that changes whenever new sensor data arrives for a pot. It is derived
+    from the pot's latest measurement, which is cached for PLOT_FRESHNESS_TTL seconds.
+    If the API is unavailable, a time bucket of the same length is used instead.
+    """
+    version = POT_VERSION_CACHE.get(str(pot_id))
+    if version is not None:
+        return version
+    latest = _make_api_request("GET", "/json/latest-value", params={"pot_id": pot_id})
+    if latest is None:
+        return f"t{int(time.time() // PLOT_FRESHNESS_TTL)}"
+    version = hashlib.sha1(json.dumps(latest, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    POT_VERSION_CACHE.set(str(pot_id), version)
+    return version
+
+
+# Map plot types to API endpoints
+PLOT_ENDPOINTS = {
+    'sunlight': '/plots/sunlight',
+    'temperature': '/plots/temperature',
+    'soil': '/plots/soil',
+    'luftfeuchtigkeit': '/plots/luftfeuchtigkeit'
+}
+
+
 @app.route('/api/plots/<plot_type>')
 @login_required
 def get_plot(plot_type: str):
@@ -495,28 +3476,172 @@ def get_plot(plot_type: str):
     if not pot_id:
         return "Missing pot_id parameter", 400
     
-    # Map plot types to API endpoints
-    plot_mapping = {
-        'sunlight': '/plots/sunlight',
-        'temperature': '/plots/temperature',
-        'soil': '/plots/soil',
-        'luftfeuchtigkeit': '/plots/luftfeuchtigkeit'
-    }
-    
-    if plot_type not in plot_mapping:
+    if plot_type not in PLOT_ENDPOINTS:
         return f"Unknown plot type: {plot_type}", 400
     
+    # Plots ändern sich nur mit neuen Messwerten: ETag aus Plot-Typ, Topf und Datenstand
+    version = _pot_data_version(pot_id)
+    etag = hashlib.sha1(f"{plot_type}:{pot_id}:{version}".encode()).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = make_response("", 304)
+        response.set_etag(etag)
+        return response
+
+    cache_key = (plot_type, pot_id, version)
+    cached = PLOT_CACHE.get(cache_key)
+    if cached is None:
+        endpoint = PLOT_ENDPOINTS[plot_type]
+        if circuit_breaker(endpoint).state == "open":
+            logging.warning(f"Plot request skipped for {plot_type}: circuit breaker open")
+            record_upstream_call("GET", endpoint, "circuit_open")
+            return f"<p>Error loading {plot_type} plot</p>", 503
+        fetched_at = time.time()
+
+        def store_plot(body: Optional[bytes]):
+            # Vollständig übertragene Plots landen zusätzlich im Cache
+            if body is not None and len(body) <= PLOT_CACHE.max_bytes:
+                PLOT_CACHE.set(cache_key, (body.decode('utf-8', 'replace'), fetched_at), len(body))
+
+        # Make direct request to API for plot data (HTML response), streamed to the client
+        response = proxy_upstream_stream(endpoint, {"pot_id": pot_id}, 'text/html', on_complete=store_plot)
+        if response is None:
+            return f"<p>Error loading {plot_type} plot</p>", 500
+        response.set_etag(etag, weak='Content-Encoding' in response.headers)
+        response.last_modified = fetched_at
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    html, last_modified = cached
+    response = make_response(html, 200, {'Content-Type': 'text/html'})
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True  # Browser muss per ETag revalidieren
+    return response.make_conditional(request)
+
+
+def prefetch_plot(plot_type: str, pot_id) -> bool:
+    """Load a plot into PLOT_CACHE under the same key get_plot uses; True if it is cached."""
+    pot_id = str(pot_id)
+    cache_key = (plot_type, pot_id, _pot_data_version(pot_id))
+    if PLOT_CACHE.get(cache_key) is not None:
+        return True
+    upstream = open_upstream_stream(PLOT_ENDPOINTS[plot_type], {"pot_id": pot_id})
+    if upstream is None:
+        return False
     try:
-        # Make direct request to API for plot data (HTML response)
-        url = f"{API_BASE}{plot_mapping[plot_type]}"
-        response = requests.get(url, params={"pot_id": pot_id})
-        response.raise_for_status()
-        
-        # Return HTML content directly
-        return response.text, 200, {'Content-Type': 'text/html'}
+        body = upstream.content
     except requests.exceptions.RequestException as e:
-        logging.error(f"Plot request failed for {plot_type}: {e}")
-        return f"<p>Error loading {plot_type} plot</p>", 500
+        logging.warning(f"Vorabladen des Plots {plot_type} für Topf {pot_id} fehlgeschlagen: {e}")
+        return False
+    finally:
+        upstream.close()
+    PLOT_CACHE.set(cache_key, (body.decode('utf-8', 'replace'), time.time()), len(body))
+    return True
+
+
+# --- Aufwärmen der Caches nach der Anmeldung ---
+class RoomViewCounter:
+    """Counts dashboard views per user and room, to know which rooms to warm up first."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._counts = TTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+
+    def record(self, user: Optional[str], room: str) -> None:
+        if not user:
+            return
+        with self._lock:
+            counts = dict(self._counts.get(user) or {})
+            counts[room] = counts.get(room, 0) + 1
+            self._counts.set(user, counts)
+
+    def top(self, user: str, limit: int) -> list:
+        counts = self._counts.get(user) or {}
+        return sorted(counts, key=counts.get, reverse=True)[:limit]
+
+
+room_views = RoomViewCounter(DATA_CACHE_MAXSIZE, 30 * 24 * 3600)
+
+
+def warm_up_user(user: str, cancelled: threading.Event) -> None:
+    """
+    Fill the caches for a freshly signed-in user: rooms and plants (with the lookup index),
+    the latest values of all pots and the plot data of the most viewed rooms, requested for
+    the room's pot exactly as the dashboard does.
+    """
+    index = user_data_index(user)
+    if cancelled.is_set():
+        return
+    latest_values_for([plant['id'] for plant in index.plants][:LATEST_VALUES_BATCH_LIMIT])
+    if PLOT_MODE == 'data' and not TIMESERIES_ENABLED:
+        return  # Zeitreihen werden nur mit lokalem Speicher vorab geladen
+    rooms_by_name = {room['name']: room for room in index.rooms}
+    names = room_views.top(user, WARMUP_ROOMS) or [room['name'] for room in index.rooms[:WARMUP_ROOMS]]
+    for name in names:
+        room = rooms_by_name.get(name)
+        if room is None or room.get('id') is None:
+            continue
+        if PLOT_MODE == 'data':
+            for endpoint in TIMESERIES_SERIES:
+                if cancelled.is_set():
+                    return
+                stored_series(endpoint, room['id'])
+            continue
+        for plot_type in PLOT_ENDPOINTS:
+            if cancelled.is_set():
+                return
+            prefetch_plot(plot_type, room['id'])
+
+
+class WarmupJobs:
+    """
+    Runs warm-up jobs on a small pool (at most one per user). Logging out cancels the job
+    of that user: a queued job does not start, a running one stops after its current step.
+    """
+
+    def __init__(self, workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='plantify-warmup')
+        self._jobs = {}  # user -> (future, cancel event)
+        self._lock = threading.Lock()
+
+    def start(self, user: str) -> None:
+        with self._lock:
+            if user in self._jobs:
+                return
+            cancelled = threading.Event()
+            self._jobs[user] = (self._executor.submit(self._run, user, cancelled), cancelled)
+
+    def cancel(self, user: str) -> None:
+        with self._lock:
+            job = self._jobs.pop(user, None)
+        if job is not None:
+            future, cancelled = job
+            cancelled.set()
+            future.cancel()
+
+    def _run(self, user: str, cancelled: threading.Event) -> None:
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                warm_up_user(user, cancelled)
+            logging.info("Caches für %s in %.2fs aufgewärmt%s.", user, time.perf_counter() - started,
+                         " (abgebrochen)" if cancelled.is_set() else "")
+        except Exception:
+            logging.exception("Fehler beim Aufwärmen der Caches für %s", user)
+        finally:
+            with self._lock:
+                if user in self._jobs and self._jobs[user][1] is cancelled:
+                    del self._jobs[user]
+
+
+warmup_jobs = WarmupJobs(WARMUP_WORKERS)
+
+
+def start_warmup(user: str) -> None:
+    if WARMUP_ENABLED:
+        warmup_jobs.start(user)
 
 
 # Einstellungen
@@ -580,8 +3705,20 @@ def change_password():
     confirm_pw = form_data.get('confirm_password')
     current_email = session.get('user_id')
 
+    if is_login_throttled(current_email):
+        flash("Zu viele fehlgeschlagene Versuche. Bitte versuchen Sie es später erneut.", "danger")
+        logging.warning("Passwortänderung gedrosselt für Benutzer %s.", current_email)
+        return redirect(url_for('settings'))
+
     hashed = get_password_hash(current_email)
-    if not hashed or not check_password(current_pw, hashed):
+    try:
+        valid = bool(hashed) and check_password(current_pw or '', hashed)
+    except HashingBusyError:
+        flash("Der Server ist gerade ausgelastet. Bitte versuchen Sie es gleich erneut.", "danger")
+        logging.warning("Passwortänderung für Benutzer %s abgelehnt: Hashing-Warteschlange voll.", current_email)
+        return redirect(url_for('settings'))
+    if not valid:
+        record_login_failure(current_email)
         flash("Aktuelles Passwort ist falsch!", "danger")
         logging.warning("Passwortänderung fehlgeschlagen für Benutzer %s: Aktuelles Passwort falsch.", current_email)
         return redirect(url_for('settings'))
@@ -592,7 +3729,12 @@ def change_password():
                         current_email)
         return redirect(url_for('settings'))
 
-    new_hash = hash_password(new_pw)
+    try:
+        new_hash = hash_password(new_pw)
+    except HashingBusyError:
+        flash("Der Server ist gerade ausgelastet. Bitte versuchen Sie es gleich erneut.", "danger")
+        logging.warning("Passwortänderung für Benutzer %s abgelehnt: Hashing-Warteschlange voll.", current_email)
+        return redirect(url_for('settings'))
 
     response_data = _make_api_request(
         "PATCH",
@@ -628,11 +3770,19 @@ def register():
         if password != confirm:
             flash('Passwörter stimmen nicht überein!', "danger")
             return render_template('register.html', error='Passwörter stimmen nicht überein!')
+        if is_login_throttled(None):
+            flash('Zu viele Versuche. Bitte versuchen Sie es später erneut.', "danger")
+            return render_template('register.html', error='Zu viele Versuche!'), 429
         if get_password_hash(email):  # Prüft, ob E-Mail bereits existiert
             flash('Diese E-Mail-Adresse ist bereits registriert!', "warning")
             return render_template('register.html', error='E-Mail existiert bereits!')
 
-        hashed = hash_password(password)
+        try:
+            hashed = hash_password(password)
+        except HashingBusyError:
+            flash("Der Server ist gerade ausgelastet. Bitte versuchen Sie es gleich erneut.", "danger")
+            logging.warning("Registrierung für E-Mail %s abgelehnt: Hashing-Warteschlange voll.", email)
+            return render_template('register.html', error='Server ausgelastet!'), 503
 
         response_data = _make_api_request(
             "POST",
@@ -643,6 +3793,7 @@ def register():
         if response_data:
             session['user_id'] = email
             logging.info("Neuer Benutzer %s erfolgreich registriert.", email)
+            start_warmup(email)
             flash("Registrierung erfolgreich! Willkommen bei Plantify!", "success")
             return redirect(url_for('index'))
         else:
@@ -0,0 +1,430 @@
+"""
+Benchmark suite for the Plantify web tier against a local stand-in for plantify-api.
+
+Runs completely offline: the stand-in API and the web app are served from this
+process on random local ports. The stand-in API has a configurable latency and
+data size, every scenario reports throughput and p50/p95/p99 latency. Examples:
+
+    python benchmark.py dashboard --duration 10 --concurrency 8 --api-latency 20
+    python benchmark.py plots --pots 20 --samples-per-day 1440
+    python benchmark.py all --duration 5 --json results.json
+    python benchmark.py login --login-concurrency 16 --dashboard-concurrency 4
+    python benchmark.py login --hash-workers 0   # Hashing im Request-Thread zum Vergleich
+    python benchmark.py dashboard --api-replicas 3 --slow-replica 200   # Lastverteilung, eine Instanz langsam
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.parse
+
+import requests
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+BENCH_USER = "bench@example.org"
+BENCH_PASSWORD = "benchmark-password"
+PLOT_TYPES = ("sunlight", "temperature", "soil", "luftfeuchtigkeit")
+
+
+def make_password_hash(password: str, iterations: int = 100_000) -> str:
+    """Same format as app.hash_password(), computed without importing the app."""
+    salt = os.urandom(16)
+    hash_bytes = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    value = f"{iterations}${base64.b64encode(salt).decode()}${base64.b64encode(hash_bytes).decode()}"
+    return urllib.parse.quote_plus(value)
+
+
+def make_day_series(pot_id: int, samples: int) -> list:
+    """Deterministic sensor readings of one day, `samples` evenly spaced records."""
+    step = 86400 / samples
+    return [
+        {
+            "pot_id": pot_id,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(1_700_000_000 + int(i * step))),
+            "temperature": round(20 + 3 * ((i * 7 + pot_id) % 11) / 11, 2),
+            "air_humidity": round(50 + 10 * ((i * 3 + pot_id) % 13) / 13, 2),
+            "soil_moisture": round(30 + 8 * ((i * 5 + pot_id) % 17) / 17, 2),
+        }
+        for i in range(samples)
+    ]
+
+
+def create_fake_api(pots: int, plants: int, samples_per_day: int = 288,
+                    latency: float = 0.0, jitter: float = 0.0) -> Flask:
+    """
+    Minimal stand-in for plantify-api with deterministic data. Every request is
+    delayed by `latency` ± `jitter` seconds to mimic the network and database.
+    """
+    fake_api = Flask("fake-plantify-api")
+    password_hash = make_password_hash(BENCH_PASSWORD)
+    pot_rows = [{"pot_id": i, "pot_name": f"Zimmer {i}"} for i in range(1, pots + 1)]
+    plant_rows = [
+        {
+            "plant_id": i,
+            "name": f"Pflanze {i}",
+            "description": "Benchmark-Pflanze",
+            "pot_name": f"Zimmer {(i % pots) + 1}",
+            "irrigation_cycle_days": 3,
+            "target_temperature_celsius": 21,
+            "target_sunlight_hours": 6,
+            "target_air_humidity_percent": 55,
+            "target_soil_moisture_percent": 35,
+        }
+        for i in range(1, plants + 1)
+    ]
+    series = {pot["pot_id"]: make_day_series(pot["pot_id"], samples_per_day) for pot in pot_rows}
+
+    def pot_series(pot_id) -> list:
+        try:
+            return series.get(int(pot_id), [])
+        except (TypeError, ValueError):
+            return []
+
+    @fake_api.before_request
+    def simulate_latency():
+        if latency or jitter:
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+    @fake_api.route('/json/password_hash')
+    def password_hash_route():
+        return jsonify([{"password_hash": password_hash}])
+
+    @fake_api.route('/json/pots')
+    def pots_route():
+        return jsonify(pot_rows)
+
+    @fake_api.route('/json/plants')
+    def plants_route():
+        return jsonify(plant_rows)
+
+    @fake_api.route('/json/latest-value')
+    def latest_value_route():
+        records = pot_series(request.args.get("pot_id"))
+        return jsonify(records[-1] if records else {})
+
+    @fake_api.route('/json/all-today')
+    def all_today_route():
+        return jsonify(pot_series(request.args.get("pot_id")))
+
+    @fake_api.route('/json/sunlight-30days')
+    def sunlight_route():
+        return jsonify([{"date": f"2024-01-{day:02d}", "sunlight_hours": day % 9} for day in range(1, 31)])
+
+    @fake_api.route('/json/average-mtd')
+    def average_mtd_route():
+        return jsonify({"temperature": 21.0, "air_humidity": 54.0, "soil_moisture": 33.0})
+
+    @fake_api.route('/plots/<plot_type>')
+    def plot_route(plot_type):
+        # Wie die echte API: HTML mit eingebetteten Messwerten, wächst mit der Datenmenge
+        records = pot_series(request.args.get("pot_id"))
+        return f"<div class=\"plot plot-{plot_type}\"><script>var data = {json.dumps(records)};</script></div>"
+
+    @fake_api.route('/<path:endpoint>', methods=['POST', 'PATCH', 'DELETE'])
+    def write_route(endpoint):
+        return jsonify({"success": True})
+
+    return fake_api
+
+
+def serve(wsgi_app) -> tuple:
+    """Serve a WSGI app on a random local port in a background thread; returns (server, base_url)."""
+    server = make_server("127.0.0.1", 0, wsgi_app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+_state_dir = None
+
+
+def start_stack(args) -> tuple:
+    """
+    Start the stand-in API (`--api-replicas` instances, the first one slowed down by
+    `--slow-replica` ms) and the web app; returns (app module, web base url). Overrides, the
+    time-series store and the cache generation file live in a temporary directory, never in
+    the app's instance folder.
+    """
+    global _state_dir
+    api_bases = []
+    for replica in range(max(1, args.api_replicas)):
+        latency = args.api_latency + (args.slow_replica if replica == 0 else 0)
+        fake_api = create_fake_api(args.pots, args.plants, args.samples_per_day, latency / 1000, args.api_jitter / 1000)
+        api_bases.append(serve(fake_api)[1])
+    os.environ['PLANTIFY_API_BASE'] = api_bases[0]
+    os.environ['PLANTIFY_API_BASES'] = ",".join(api_bases)
+    os.environ['PLANTIFY_HASH_WORKERS'] = str(args.hash_workers)
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    _state_dir = tempfile.TemporaryDirectory(prefix='plantify-benchmark-')  # wird beim Beenden gelöscht
+    os.environ['PLANTIFY_OVERRIDE_DB'] = os.path.join(_state_dir.name, 'plant_overrides.sqlite3')
+    os.environ['PLANTIFY_TIMESERIES_DIR'] = os.path.join(_state_dir.name, 'timeseries')
+    os.environ['PLANTIFY_CACHE_GENERATION_FILE'] = os.path.join(_state_dir.name, 'user_data.generation')
+    import app as plantify  # Erst nach dem Setzen der Umgebungsvariablen importieren
+
+    _, web_base = serve(plantify.app)
+    return plantify, web_base
+
+
+def logged_in_client(web_base: str) -> dict:
+    """Per-thread client state: a logged-in session and the ETags it has seen."""
+    http = requests.Session()
+    response = http.post(f"{web_base}/login", data={"email": BENCH_USER, "password": BENCH_PASSWORD},
+                         allow_redirects=False)
+    if response.status_code != 302:
+        raise RuntimeError(f"Benchmark-Login fehlgeschlagen: HTTP {response.status_code}")
+    return {"http": http, "etags": {}}
+
+
+def percentile(samples: list, p: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(name: str, samples: list, errors: int, duration: float) -> dict:
+    return {
+        "scenario": name,
+        "requests": len(samples),
+        "errors": errors,
+        "throughput": len(samples) / duration,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def format_result(result: dict) -> str:
+    return (f"{result['scenario']:<12} {result['throughput']:8.1f} req/s   "
+            f"p50 {result['p50_ms']:8.1f} ms   p95 {result['p95_ms']:8.1f} ms   "
+            f"p99 {result['p99_ms']:8.1f} ms   (n={result['requests']}, Fehler={result['errors']})")
+
+
+def measure(workers: dict, duration: float) -> dict:
+    """
+    Run the given workers ({name: (count, setup, step)}) concurrently for `duration`
+    seconds. `setup()` returns the per-thread state, `step(state)` performs one
+    operation and returns True on success. Returns {name: (latencies, errors)}.
+    """
+    stop = threading.Event()
+    results = {name: ([], [0]) for name in workers}
+    lock = threading.Lock()
+
+    def run(name, setup, step):
+        state = setup()
+        latencies, errors = results[name]
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                ok = step(state)
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [
+        threading.Thread(target=run, args=(name, setup, step))
+        for name, (count, setup, step) in workers.items()
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {name: (latencies, errors[0]) for name, (latencies, errors) in results.items()}
+
+
+# --- Szenarien: jeweils step(client) -> bool für einen eingeloggten Client ---
+def dashboard_step(ctx: dict):
+    def step(client):
+        pot = random.randint(1, ctx["pots"])
+        return client["http"].get(f"{ctx['web_base']}/dashboard/{ctx['slugify'](f'Zimmer {pot}')}").status_code == 200
+    return step
+
+
+def plant_step(ctx: dict):
+    def step(client):
+        plant_id = random.randint(1, ctx["plants"])
+        slug = f"{ctx['slugify'](f'Pflanze {plant_id}')}-{plant_id}"
+        return client["http"].get(f"{ctx['web_base']}/pflanze/{slug}").status_code == 200
+    return step
+
+
+def plots_step(ctx: dict):
+    """Load all plots of a random pot like a browser does: revalidate with the ETag seen before."""
+    def step(client):
+        http, etags = client["http"], client["etags"]
+        pot = random.randint(1, ctx["pots"])
+        for plot_type in PLOT_TYPES:
+            headers = {"If-None-Match": etags[(plot_type, pot)]} if (plot_type, pot) in etags else {}
+            response = http.get(f"{ctx['web_base']}/api/plots/{plot_type}", params={"pot_id": pot},
+                                headers=headers)
+            if response.status_code not in (200, 304):
+                return False
+            if response.headers.get("ETag"):
+                etags[(plot_type, pot)] = response.headers["ETag"]
+        return True
+    return step
+
+
+def data_step(ctx: dict):
+    def step(client):
+        pot = random.randint(1, ctx["pots"])
+        params = {"max_points": ctx["max_points"]} if ctx["max_points"] else {}
+        return client["http"].get(f"{ctx['web_base']}/api/data/all-today/{pot}", params=params).status_code == 200
+    return step
+
+
+def edit_step(ctx: dict):
+    """One bulk edit: update `batch_size` plant profiles and rename a pot, then view the dashboard."""
+    def step(client):
+        http = client["http"]
+        for plant_id in random.sample(range(1, ctx["plants"] + 1), min(ctx["batch_size"], ctx["plants"])):
+            response = http.post(f"{ctx['web_base']}/api/plant/{plant_id}",
+                                 json={"target_temperature_celsius": random.randint(18, 24)})
+            if response.status_code != 200:
+                return False
+        pot = random.randint(1, ctx["pots"])
+        if http.patch(f"{ctx['web_base']}/api/pots/{pot}", json={"pot_name": f"Zimmer {pot}"}).status_code != 200:
+            return False
+        return http.get(f"{ctx['web_base']}/dashboard/{ctx['slugify'](f'Zimmer {pot}')}").status_code == 200
+    return step
+
+
+def provision_step(ctx: dict):
+    """Provisioning via the bulk API: create `batch_size` plants and assign them to a pot in two requests."""
+    plant = {"name": "Neue Pflanze", "description": "Benchmark-Pflanze", "irrigation_cycle_days": 3,
+             "target_temperature_celsius": 21, "target_sunlight_hours": 6,
+             "target_air_humidity_percent": 55, "target_soil_moisture_percent": 35}
+
+    def step(client):
+        http = client["http"]
+        created = http.post(f"{ctx['web_base']}/api/plants/bulk", json={"plants": [plant] * ctx["batch_size"]})
+        if created.status_code != 200:
+            return False
+        plant_ids = random.sample(range(1, ctx["plants"] + 1), min(ctx["batch_size"], ctx["plants"]))
+        assigned = http.post(f"{ctx['web_base']}/api/plant-pot-assignments/bulk",
+                             json={"pot_ids": [random.randint(1, ctx["pots"])], "plant_ids": plant_ids})
+        return assigned.status_code == 200
+    return step
+
+
+SCENARIOS = {
+    "dashboard": dashboard_step,
+    "plant": plant_step,
+    "plots": plots_step,
+    "data": data_step,
+    "edit": edit_step,
+    "provision": provision_step,
+}
+
+
+def scenario_context(args, plantify, web_base: str) -> dict:
+    return {"web_base": web_base, "pots": args.pots, "plants": args.plants, "slugify": plantify.slugify,
+            "batch_size": args.batch_size, "max_points": args.max_points}
+
+
+def run_scenarios(args, names: list) -> list:
+    plantify, web_base = start_stack(args)
+    ctx = scenario_context(args, plantify, web_base)
+    print(f"Stand-in API: {args.pots} Töpfe, {args.plants} Pflanzen, {args.samples_per_day} Messwerte/Tag, "
+          f"Latenz {args.api_latency}±{args.api_jitter} ms, {args.api_replicas} Instanz(en); "
+          f"{args.concurrency} Clients, {args.duration}s je Szenario")
+    results = []
+    for name in names:
+        step = SCENARIOS[name](ctx)
+        latencies, errors = measure({name: (args.concurrency, lambda: logged_in_client(web_base), step)},
+                                    args.duration)[name]
+        result = summarize(name, latencies, errors, args.duration)
+        print(format_result(result))
+        results.append(result)
+    return results
+
+
+def run_login_benchmark(args) -> list:
+    """
+    Hammer /login with concurrent (valid) logins while measuring the latency of
+    dashboard views from already logged-in sessions.
+    """
+    plantify, web_base = start_stack(args)
+    ctx = scenario_context(args, plantify, web_base)
+
+    def login_step(http):
+        response = http.post(f"{web_base}/login", data={"email": BENCH_USER, "password": BENCH_PASSWORD},
+                             allow_redirects=False)
+        return response.status_code == 302
+
+    measured = measure({
+        "login": (args.login_concurrency, requests.Session, login_step),
+        "dashboard": (args.dashboard_concurrency, lambda: logged_in_client(web_base), dashboard_step(ctx)),
+    }, args.duration)
+
+    print(f"Login-Benchmark: {args.duration}s, {args.login_concurrency} Login-Clients, "
+          f"{args.dashboard_concurrency} Dashboard-Clients, hash workers={args.hash_workers}")
+    results = [summarize(name, latencies, errors, args.duration) for name, (latencies, errors) in measured.items()]
+    for result in results:
+        print(format_result(result))
+    return results
+
+
+def main() -> None:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--duration", type=float, default=10, help="Sekunden je Szenario")
+    common.add_argument("--concurrency", type=int, default=8, help="gleichzeitige Clients")
+    common.add_argument("--pots", type=int, default=5)
+    common.add_argument("--plants", type=int, default=20)
+    common.add_argument("--samples-per-day", type=int, default=288, help="Messwerte pro Topf und Tag")
+    common.add_argument("--api-latency", type=float, default=0, help="Latenz der Stand-in API in ms")
+    common.add_argument("--api-jitter", type=float, default=0, help="zufällige Abweichung der Latenz in ms")
+    common.add_argument("--api-replicas", type=int, default=1, help="Anzahl Stand-in API Instanzen")
+    common.add_argument("--slow-replica", type=float, default=0, help="zusätzliche Latenz der ersten Instanz in ms")
+    common.add_argument("--hash-workers", type=int, default=2)
+    common.add_argument("--batch-size", type=int, default=5, help="Pflanzen pro Bulk-Edit (Szenarien edit, provision)")
+    common.add_argument("--max-points", type=int, default=0, help="Downsampling im Szenario data (0 = aus)")
+    common.add_argument("--json", metavar="PATH", help="Ergebnisse zusätzlich als JSON speichern")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="scenario", required=True)
+
+    login = subparsers.add_parser("login", parents=[common],
+                                  help="login throughput and dashboard latency under login load")
+    login.add_argument("--login-concurrency", type=int, default=16)
+    login.add_argument("--dashboard-concurrency", type=int, default=4)
+    login.set_defaults(run=run_login_benchmark)
+
+    scenario_help = {
+        "dashboard": "room dashboard views",
+        "plant": "plant detail pages",
+        "plots": "plot loads with ETag revalidation",
+        "data": "raw sensor data of the day (optionally downsampled)",
+        "edit": "bulk edits of plant profiles and pots followed by a dashboard view",
+        "provision": "bulk creation of plants and plant-pot assignments via the bulk API",
+    }
+    for name, text in scenario_help.items():
+        subparsers.add_parser(name, parents=[common], help=text).set_defaults(
+            run=lambda args, name=name: run_scenarios(args, [name]))
+    subparsers.add_parser("all", parents=[common], help="all scenarios except login, one after another").set_defaults(
+        run=lambda args: run_scenarios(args, list(SCENARIOS)))
+
+    args = parser.parse_args()
+    results = args.run(args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": {key: value for key, value in vars(args).items() if key != "run"},
+                       "results": results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+"""
+PBKDF2 for the password hashing process pool of app.py. Kept free of imports with side
+effects so that pool workers (started with forkserver/spawn) do not have to load the app.
+"""
+import hashlib
+
+
+def pbkdf2(password: bytes, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password, salt, iterations)
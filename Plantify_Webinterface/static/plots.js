@@ -1,7 +1,15 @@
-// Load Plotly graphs and latest measurements from plantify_api
+// Load Plotly graphs and latest measurements through the Flask proxy (/api/...)
 
-function loadPlots(baseUrl) {
-    const potId = new URLSearchParams(window.location.search).get('pot_id') || '1';
+// Pot of the dashboard's room; an explicit ?pot_id in the page URL takes precedence
+function currentPotId() {
+    const charts = document.querySelector('.charts-card');
+    return new URLSearchParams(window.location.search).get('pot_id')
+        || (charts && charts.dataset.potId) || '1';
+}
+
+// Plot HTML via the Flask proxy (cached, revalidated per ETag)
+function loadPlots(proxyBase) {
+    const potId = currentPotId();
     const map = {
         'plot-sun': 'sunlight',
         'plot-temp': 'temperature',
@@ -11,7 +19,7 @@ function loadPlots(baseUrl) {
     Object.entries(map).forEach(([elementId, plot]) => {
         const el = document.getElementById(elementId);
         if (!el) return;
-        fetch(`${baseUrl}/plots/${plot}?pot_id=${potId}`)
+        fetch(`${proxyBase}/${plot}?pot_id=${potId}`)
             .then(r => r.text())
             .then(html => {
                 el.innerHTML = html;
@@ -20,24 +28,99 @@ function loadPlots(baseUrl) {
     });
 }
 
-function loadLatestValues(baseUrl) {
-    const rows = document.querySelectorAll('#care-guidelines tbody tr');
+// Compact data mode: fetch columnar time series and render them with the shared Plotly instance
+const X_COLUMNS = ['timestamp', 'time', 'date', 'day', 'measured_at'];
+
+function xColumn(columns) {
+    const key = X_COLUMNS.find(name => name in columns);
+    return key ? columns[key] : null;
+}
+
+function renderSeries(elementId, columns, yKeys, title) {
+    const el = document.getElementById(elementId);
+    const yKey = yKeys.find(name => name in columns);
+    if (!el || !yKey) return;
+    const y = columns[yKey];
+    const x = xColumn(columns) || y.map((_, i) => i);
+    Plotly.react(el, [{x: x, y: y, type: 'scatter', mode: 'lines', name: title}], {
+        margin: {t: 10, r: 10, b: 40, l: 40},
+        yaxis: {title: title}
+    }, {responsive: true, displayModeBar: false});
+}
+
+function loadPlotData(proxyBase) {
+    const potId = currentPotId();
+    // Nicht mehr Punkte anfordern, als der Bildschirm darstellen kann
+    const maxPoints = Math.max(Math.round(window.innerWidth), 300);
+    const getColumns = (path, algorithm) => fetch(`${proxyBase}/${path}/${potId}?max_points=${maxPoints}&downsample=${algorithm}`)
+        .then(r => r.json())
+        .then(d => d.columns || {});
+
+    getColumns('all-today', 'mean')
+        .then(columns => {
+            renderSeries('plot-temp', columns, ['temperature'], 'Temperatur (°C)');
+            renderSeries('plot-soil', columns, ['soil_moisture'], 'Bodenfeuchtigkeit (%)');
+            renderSeries('plot-air', columns, ['air_humidity'], 'Luftfeuchtigkeit (%)');
+        })
+        .catch(err => console.error('Failed to load today series', err));
+
+    getColumns('sunlight-30days', 'lttb')
+        .then(columns => {
+            const yKeys = ['sunlight_hours', 'sunlight', 'hours']
+                .concat(Object.keys(columns).filter(k => !X_COLUMNS.includes(k) && k !== 'pot_id'));
+            renderSeries('plot-sun', columns, yKeys, 'Sonnenstunden');
+        })
+        .catch(err => console.error('Failed to load sunlight series', err));
+}
+
+function potRows() {
+    return Array.from(document.querySelectorAll('#care-guidelines tbody tr'))
+        .filter(row => row.dataset.potId);
+}
+
+function showLatestValues(rows, values) {
     rows.forEach(row => {
-        const id = row.dataset.potId;
-        if (!id) return;
-        fetch(`${baseUrl}/latest-value?pot_id=${id}`)
-            .then(r => r.json())
-            .then(d => {
-                row.querySelector('.val-temp').textContent = parseFloat(d.temperature).toFixed(1);
-                row.querySelector('.val-air').textContent = parseFloat(d.air_humidity).toFixed(1);
-                row.querySelector('.val-soil').textContent = parseFloat(d.soil_moisture).toFixed(1);
-            })
-            .catch(err => console.error('Failed to load latest values', err));
+        const d = values[row.dataset.potId];
+        if (!d) return;
+        row.querySelector('.val-temp').textContent = parseFloat(d.temperature).toFixed(1);
+        row.querySelector('.val-air').textContent = parseFloat(d.air_humidity).toFixed(1);
+        row.querySelector('.val-soil').textContent = parseFloat(d.soil_moisture).toFixed(1);
+    });
+}
+
+function loadLatestValues(proxyBase) {
+    // Bereits serverseitig gerenderte Zeilen überspringen
+    const rows = potRows().filter(row => !row.dataset.loaded);
+    if (!rows.length) return;
+    const ids = rows.map(row => row.dataset.potId);
+    fetch(`${proxyBase}/latest-values?pot_id=${ids.join(',')}`)
+        .then(r => r.json())
+        .then(values => showLatestValues(rows, values))
+        .catch(err => console.error('Failed to load latest values', err));
+}
+
+// Live updates: the server pushes only the pots whose values changed
+function subscribeLatestValues(streamBase) {
+    const rows = potRows();
+    if (!rows.length || !window.EventSource) return;
+    const ids = rows.map(row => row.dataset.potId);
+    const source = new EventSource(`${streamBase}/latest-values?pot_id=${ids.join(',')}`);
+    source.addEventListener('latest-values', event => {
+        showLatestValues(rows, JSON.parse(event.data));
     });
+    window.addEventListener('beforeunload', () => source.close());
 }
 
 document.addEventListener('DOMContentLoaded', () => {
-    const apiBase = 'http://localhost:5001';
-    loadPlots(apiBase);
-    loadLatestValues(apiBase);
+    const charts = document.querySelector('.charts-card');
+    if (charts && charts.dataset.plotMode === 'data' && window.Plotly) {
+        loadPlotData('/api/series');
+    } else {
+        loadPlots('/api/plots');
+    }
+    loadLatestValues('/api/data');
+    const table = document.getElementById('care-guidelines');
+    if (table && table.dataset.liveUpdates === 'true') {
+        subscribeLatestValues('/api/stream');
+    }
 });